@@ -1,4 +1,10 @@
 #!/usr/bin/env python3
+import sys
+
+if __name__ == '__main__' and len(sys.argv) > 1:
+    from queuectl.cli import main as cli_main
+    sys.exit(cli_main(sys.argv[1:]))
+
 import os
 import time
 import signal
@@ -53,10 +59,15 @@ def add_job():
     job_id = input("Job ID (auto-generate): ").strip() or None
     max_retries = input("Max retries (3): ").strip()
     max_retries = int(max_retries) if max_retries.isdigit() else None
+    timeout = input("Timeout seconds (default): ").strip()
+    if timeout and not (timeout.isdigit() and int(timeout) > 0):
+        print("Error: Timeout must be a whole number of seconds greater than 0")
+        return
+    timeout = int(timeout) if timeout else None
 
     queue_manager = get_queue_manager()
     worker_manager = get_worker_manager()
-    job = queue_manager.enqueue(command, job_id, max_retries)
+    job = queue_manager.enqueue(command, job_id, max_retries, timeout)
     worker_status = worker_manager.get_worker_status()
 
     print(f"✓ Job {job.id} added")
@@ -121,13 +132,31 @@ def list_jobs():
         if job.error_message:
             print(f"  Error: {job.error_message[:80]}")
 
+    job_id = input("\nShow output for job ID (skip): ").strip()
+    if job_id:
+        show_job_result(queue_manager, job_id)
+
+def show_job_result(queue_manager, job_id):
+    result = queue_manager.get_job_result(job_id)
+    if not result:
+        print(f"✗ No output stored for job {job_id}")
+        return
+
+    print(f"\n[{result.job_id}] attempt {result.attempt} | exit code {result.exit_code} | {result.created_at}")
+    if result.truncated:
+        print(f"(truncated: stdout {result.stdout_size} bytes, stderr {result.stderr_size} bytes)")
+    print("--- stdout ---")
+    print(result.stdout.rstrip() or "(empty)")
+    print("--- stderr ---")
+    print(result.stderr.rstrip() or "(empty)")
+
 def start_workers():
     print("\n--- Start Workers ---")
     worker_manager = get_worker_manager()
     count = input("Workers to start (1): ").strip()
     count = int(count) if count.isdigit() and int(count) > 0 else 1
-    worker_manager.start_workers(count)
-    print(f"✓ Started {count} worker(s)")
+    if worker_manager.start_workers(count):
+        print(f"✓ Started {count} worker(s)")
 
 def stop_workers():
     print("\n--- Stop Workers ---")
@@ -153,26 +182,31 @@ def worker_status():
     print(f"Workers: {ws['workers']}" + (f" (PIDs: {', '.join(map(str, ws['pids']))})" if ws['pids'] else " - None running"))
     print(f"Queue: {qs['pending']} pending | {qs['processing']} running | {qs['completed']} done | {qs['failed']} failed")
 
+DLQ_LIST_LIMIT = 50
+
 def dlq_menu():
     print("\n--- Dead Letter Queue ---")
-    print("1. List  2. Retry")
+    print("1. List  2. Retry  3. Groups  4. Retry Group  5. Purge Group")
     choice = input("Option: ").strip()
 
     queue_manager = get_queue_manager()
 
     if choice == '1':
-        jobs = queue_manager.get_jobs_by_state(JobState.DEAD)
+        jobs = queue_manager.get_jobs_by_state(JobState.DEAD, DLQ_LIST_LIMIT)
         if not jobs:
             print("No dead jobs")
             return
 
-        print(f"\nDead jobs ({len(jobs)}):")
+        total = queue_manager.get_status()['dead']
+        print(f"\nDead jobs ({total}):")
         for job in jobs:
             print(f"✗ [{job.id}] {job.command[:60]}")
-            print(f"  Failed: {job.attempts} tries | {job.error_message[:80]}")
+            print(f"  Failed: {job.attempts} tries | {(job.error_message or '')[:80]}")
+        if total > len(jobs):
+            print(f"  (+{total - len(jobs)} more, see 3. Groups)")
 
     elif choice == '2':
-        jobs = queue_manager.get_jobs_by_state(JobState.DEAD)
+        jobs = queue_manager.get_jobs_by_state(JobState.DEAD, DLQ_LIST_LIMIT)
         if not jobs:
             print("No dead jobs")
             return
@@ -186,12 +220,50 @@ def dlq_menu():
         else:
             print(f"✗ Job {job_id} not found")
 
+    elif choice in ('3', '4', '5'):
+        groups = queue_manager.get_dlq_groups(DLQ_LIST_LIMIT)
+        if not groups:
+            print("No dead jobs")
+            return
+
+        print(f"\nFailure groups ({len(groups)}):")
+        for index, group in enumerate(groups, 1):
+            print(f"{index}. [{group['fingerprint']}] {group['count']} job(s) | last {group['last_seen']}")
+            print(f"   {(group['command'] or '')[:60]}")
+            print(f"   Error: {(group['error_message'] or '')[:80]}")
+
+        if choice == '3':
+            return
+
+        selection = input("\nGroup number: ").strip()
+        if not selection.isdigit() or not 1 <= int(selection) <= len(groups):
+            print("✗ Invalid group")
+            return
+        group = groups[int(selection) - 1]
+
+        if choice == '4':
+            rate = input("Jobs per second (all at once): ").strip()
+            if rate:
+                if not rate.replace('.', '', 1).isdigit() or float(rate) <= 0:
+                    print("✗ Rate must be a number greater than 0")
+                    return
+                rate = float(rate)
+            else:
+                rate = None
+            count = queue_manager.retry_dlq_jobs(fingerprint=group['fingerprint'], rate=rate)
+            print(f"✓ {count} job(s) re-queued" + (f" at {rate:g}/s" if rate else ""))
+        else:
+            confirm = input(f"Delete {group['count']} job(s)? (y/n): ").strip().lower()
+            if confirm == 'y':
+                count = queue_manager.purge_dlq_jobs(fingerprint=group['fingerprint'])
+                print(f"✓ {count} job(s) purged")
+
     else:
         print("Invalid option")
 
 def config_menu():
     print("\n--- Config ---")
-    print("1. Show  2. Max Retries  3. Backoff Base")
+    print("1. Show  2. Max Retries  3. Backoff Base  4. Jitter  5. Max Delay  6. Timeout  7. Limits")
     choice = input("Option: ").strip()
 
     storage = Storage()
@@ -200,6 +272,10 @@ def config_menu():
     if choice == '1':
         print(f"\nMax Retries: {config.max_retries}")
         print(f"Backoff Base: {config.backoff_base} (delays: {config.backoff_base}s, {config.backoff_base**2}s, {config.backoff_base**3}s...)")
+        print(f"Jitter: {config.backoff_jitter} | Max Delay: {config.backoff_max_delay}s")
+        print(f"Retry Batch Size: {config.retry_batch_size}")
+        print(f"Job Timeout: {config.job_timeout}s | Kill Grace: {config.kill_grace}s")
+        print(f"Limits: CPU {config.limit_cpu_seconds or '-'}s | Memory {config.limit_memory_mb or '-'}MB | Open Files {config.limit_open_files or '-'}")
         print(f"DB Path: {config.db_path}")
 
     elif choice == '2':
@@ -216,10 +292,53 @@ def config_menu():
         if value.isdigit() and int(value) > 0:
             config.backoff_base = int(value)
             storage.save_full_config(config)
-            print(f"✓ Backoff: {value}s, {value**2}s, {value**3}s...")
+            print(f"✓ Backoff: {config.backoff_base}s, {config.backoff_base**2}s, {config.backoff_base**3}s...")
+        else:
+            print("✗ Invalid value")
+
+    elif choice == '4':
+        value = input(f"Jitter ({'/'.join(Config.JITTER_STRATEGIES)}) [{config.backoff_jitter}]: ").strip().lower()
+        if value in Config.JITTER_STRATEGIES:
+            config.backoff_jitter = value
+            storage.save_full_config(config)
+            print(f"✓ Jitter: {value}")
+        else:
+            print("✗ Invalid value")
+
+    elif choice == '5':
+        value = input(f"Max delay in seconds, 0 for none ({config.backoff_max_delay}): ").strip()
+        if value.isdigit():
+            config.backoff_max_delay = int(value)
+            storage.save_full_config(config)
+            print(f"✓ Max delay: {value}s")
+        else:
+            print("✗ Invalid value")
+
+    elif choice == '6':
+        value = input(f"Default job timeout in seconds ({config.job_timeout}): ").strip()
+        if value.isdigit() and int(value) > 0:
+            config.job_timeout = int(value)
+            storage.save_full_config(config)
+            print(f"✓ Job timeout: {value}s")
         else:
             print("✗ Invalid value")
 
+    elif choice == '7':
+        limits = [
+            ("limit_cpu_seconds", "CPU seconds"),
+            ("limit_memory_mb", "Memory MB"),
+            ("limit_open_files", "Open files"),
+        ]
+        for key, label in limits:
+            value = input(f"{label}, 0 for none ({getattr(config, key)}): ").strip()
+            if value.isdigit():
+                setattr(config, key, int(value))
+            elif value:
+                print("✗ Invalid value")
+                return
+        storage.save_full_config(config)
+        print("✓ Limits updated")
+
     else:
         print("Invalid option")
 
@@ -0,0 +1,392 @@
+import asyncio
+import hmac
+import ipaddress
+import secrets
+import signal
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+from .executor import ExecutionResult
+from .models import Job
+from .protocol import ProtocolError, read_frame, encode_frame, send_frame, recv_frame
+from .queue import QueueManager
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 7878
+DEFAULT_LEASE_SECONDS = 60
+MAX_CLAIM_BATCH = 100
+
+def parse_address(address: str) -> Tuple[str, int]:
+    host, _, port = address.rpartition(":")
+    if not host:
+        return address or DEFAULT_HOST, DEFAULT_PORT
+    return host, int(port)
+
+def is_loopback(host: str) -> bool:
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+def generate_token() -> str:
+    return secrets.token_urlsafe(32)
+
+def _utc_timestamp(seconds_from_now: float = 0) -> str:
+    moment = datetime.now(timezone.utc) + timedelta(seconds=seconds_from_now)
+    return moment.isoformat(timespec="microseconds").replace('+00:00', 'Z')
+
+class JobBroker:
+    def __init__(
+        self,
+        queue_manager: QueueManager,
+        host: str = DEFAULT_HOST,
+        port: int = DEFAULT_PORT,
+        lease_seconds: int = DEFAULT_LEASE_SECONDS,
+        token: Optional[str] = None,
+    ):
+        if not token and not is_loopback(host):
+            raise ValueError(
+                f"Refusing to listen on {host} without a broker token; "
+                "run 'queuectl broker token' to create one"
+            )
+
+        self.queue_manager = queue_manager
+        self.host = host
+        self.port = port
+        self.lease_seconds = lease_seconds
+        self.token = token
+        self._recorded = set()
+        self._db = ThreadPoolExecutor(max_workers=1, thread_name_prefix="queuectl-broker-db")
+        self._server = None
+        self._loop = None
+        self._stopping = None
+        self._clients = set()
+        self.started = threading.Event()
+        self._handlers = {
+            "hello": self._op_hello,
+            "enqueue": self._op_enqueue,
+            "claim": self._op_claim,
+            "heartbeat": self._op_heartbeat,
+            "ack": self._op_ack,
+            "status": self._op_status,
+        }
+
+    def run(self):
+        asyncio.run(self.serve())
+
+    async def serve(self):
+        self._loop = asyncio.get_running_loop()
+        self._stopping = asyncio.Event()
+        self._server = await asyncio.start_server(self._handle_client, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            try:
+                self._loop.add_signal_handler(signum, self._stopping.set)
+            except (NotImplementedError, RuntimeError):
+                pass
+
+        reaper = asyncio.ensure_future(self._reap_expired_leases())
+        print(
+            f"Broker listening on {self.host}:{self.port} (lease {self.lease_seconds}s, "
+            f"{'token required' if self.token else 'no token'})"
+        )
+
+        self.started.set()
+
+        try:
+            await self._stopping.wait()
+            self._server.close()
+            for client in list(self._clients):
+                client.cancel()
+            await asyncio.gather(*self._clients, return_exceptions=True)
+            await self._server.wait_closed()
+        finally:
+            reaper.cancel()
+            if self.queue_manager.write_buffer:
+                await self._call_db(self.queue_manager.write_buffer.flush)
+            self._db.shutdown(wait=True)
+            print("Broker stopped")
+
+    def close(self):
+        if self._loop is None:
+            return
+        try:
+            self._loop.call_soon_threadsafe(self._stopping.set)
+        except RuntimeError:
+            pass
+
+    async def _handle_client(self, reader, writer):
+        task = asyncio.current_task()
+        self._clients.add(task)
+        authenticated = not self.token
+        try:
+            while True:
+                try:
+                    request = await read_frame(reader)
+                except asyncio.IncompleteReadError:
+                    break
+
+                response = {"id": request.get("id")}
+                op = request.get("op")
+
+                if op == "hello":
+                    authenticated = self._check_token(request.get("token"))
+                if not authenticated:
+                    response["ok"] = False
+                    response["error"] = "Invalid broker token" if op == "hello" else "Authentication required"
+                    writer.write(encode_frame(response))
+                    await writer.drain()
+                    break
+
+                handler = self._handlers.get(op)
+                try:
+                    if not handler:
+                        raise ProtocolError(f"Unknown op: {op}")
+                    response.update(await handler(request))
+                    response["ok"] = True
+                except Exception as e:
+                    response["ok"] = False
+                    response["error"] = str(e)
+
+                writer.write(encode_frame(response))
+                await writer.drain()
+        except (ConnectionError, ProtocolError) as e:
+            print(f"Broker: dropping client: {e}")
+        except asyncio.CancelledError:
+            pass
+        finally:
+            self._clients.discard(task)
+            writer.close()
+
+    def _check_token(self, token: Any) -> bool:
+        if not self.token:
+            return True
+        return isinstance(token, str) and hmac.compare_digest(token.encode("utf-8"), self.token.encode("utf-8"))
+
+    async def _call_db(self, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._db, func, *args)
+
+    async def _op_hello(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        config = self.queue_manager.config
+        return {"settings": {
+            "job_timeout": config.job_timeout,
+            "kill_grace": config.kill_grace,
+            "limit_cpu_seconds": config.limit_cpu_seconds,
+            "limit_memory_mb": config.limit_memory_mb,
+            "limit_open_files": config.limit_open_files,
+            "result_max_bytes": config.result_max_bytes,
+        }}
+
+    async def _op_enqueue(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        jobs = await self._call_db(self.queue_manager.enqueue_batch, request.get("jobs", []))
+        return {"job_ids": [job.id for job in jobs]}
+
+    async def _op_claim(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        limit = max(1, min(int(request.get("max_jobs", 1)), MAX_CLAIM_BATCH))
+        lease_seconds = int(request.get("lease_seconds") or self.lease_seconds)
+        jobs = await self._call_db(self.queue_manager.claim_jobs, limit, _utc_timestamp(lease_seconds))
+
+        payload = []
+        for job in jobs:
+            data = job.to_dict()
+            data["timeout"] = job.timeout or self.queue_manager.config.job_timeout
+            payload.append(data)
+
+        return {"jobs": payload, "lease_seconds": lease_seconds}
+
+    async def _op_heartbeat(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        lease_seconds = int(request.get("lease_seconds") or self.lease_seconds)
+        job_ids = list(request.get("job_ids", []))
+        held = await self._call_db(
+            self.queue_manager.storage.extend_leases, job_ids, _utc_timestamp(lease_seconds), _utc_timestamp(),
+        )
+
+        held_ids = set(held)
+        return {"held": held, "lost": [job_id for job_id in job_ids if job_id not in held_ids]}
+
+    async def _op_ack(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        return await self._call_db(self._record_acks, request.get("results", []))
+
+    async def _op_status(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        status = await self._call_db(self.queue_manager.get_status)
+        leases = await self._call_db(self.queue_manager.storage.count_leased_jobs)
+        return {"jobs": status, "leases": leases}
+
+    def _record_acks(self, entries: List[Dict[str, Any]]) -> Dict[str, Any]:
+        entries = {entry.get("id"): entry for entry in entries}
+        jobs = [
+            job for job in self.queue_manager.storage.get_leased_jobs(list(entries))
+            if job.id not in self._recorded
+        ]
+
+        for job in jobs:
+            entry = entries[job.id]
+            self._record(job, ExecutionResult(
+                success=bool(entry.get("success")),
+                message=entry.get("message") or "",
+                exit_code=entry.get("exit_code"),
+                stdout=entry.get("stdout") or "",
+                stderr=entry.get("stderr") or "",
+                interrupted=bool(entry.get("interrupted")),
+                stdout_size=int(entry.get("stdout_size") or 0),
+                stderr_size=int(entry.get("stderr_size") or 0),
+            ))
+
+        accepted = {job.id for job in jobs}
+        return {
+            "accepted": [job.id for job in jobs],
+            "rejected": [job_id for job_id in entries if job_id not in accepted],
+        }
+
+    def _record(self, job: Job, result: ExecutionResult):
+        self.queue_manager.record_result(job, result)
+        if self.queue_manager.write_buffer:
+            self._recorded.add(job.id)
+
+    def _expire_leases(self) -> int:
+        if self.queue_manager.write_buffer:
+            self.queue_manager.write_buffer.flush()
+        self._recorded.clear()
+
+        expired = self.queue_manager.storage.get_expired_leases(_utc_timestamp())
+        for job in expired:
+            print(f"Broker: lease on job {job.id} expired")
+            self._record(job, ExecutionResult(False, "Lease expired before the job was acknowledged"))
+        return len(expired)
+
+    async def _reap_expired_leases(self):
+        while True:
+            try:
+                await self._call_db(self._expire_leases)
+            except Exception as e:
+                print(f"Broker: lease reaper failed, will retry: {e}")
+            await asyncio.sleep(max(self.lease_seconds / 4, 0.5))
+
+class BrokerError(Exception):
+    pass
+
+class BrokerClient:
+    def __init__(
+        self,
+        host: str = DEFAULT_HOST,
+        port: int = DEFAULT_PORT,
+        token: Optional[str] = None,
+        timeout: float = 30.0,
+    ):
+        self.host = host
+        self.port = port
+        self.token = token
+        self.timeout = timeout
+        self.settings: Dict[str, Any] = {}
+        self._sock: Optional[socket.socket] = None
+        self._lock = threading.Lock()
+        self._next_id = 0
+
+    def hello(self) -> Dict[str, Any]:
+        with self._lock:
+            if self._sock is None:
+                self._connect()
+            return dict(self.settings)
+
+    def enqueue(self, jobs: List[Dict[str, Any]]) -> List[str]:
+        return self._request("enqueue", jobs=jobs)["job_ids"]
+
+    def claim(self, max_jobs: int = 1, lease_seconds: Optional[int] = None) -> List[Job]:
+        response = self._request("claim", max_jobs=max_jobs, lease_seconds=lease_seconds)
+        return [Job.from_dict(data) for data in response["jobs"]]
+
+    def heartbeat(self, job_ids: List[str], lease_seconds: Optional[int] = None) -> List[str]:
+        return self._request("heartbeat", job_ids=job_ids, lease_seconds=lease_seconds)["lost"]
+
+    def ack(self, results: List[Dict[str, Any]]) -> List[str]:
+        return self._request("ack", results=results)["rejected"]
+
+    def status(self) -> Dict[str, Any]:
+        return self._request("status")
+
+    def close(self):
+        with self._lock:
+            self._disconnect()
+
+    def _request(self, op: str, **fields) -> Dict[str, Any]:
+        with self._lock:
+            if self._sock is None:
+                self._connect()
+            response = self._exchange(op, **fields)
+
+        if not response.get("ok"):
+            raise BrokerError(response.get("error", "Unknown broker error"))
+        return response
+
+    def _connect(self):
+        self._sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+        self._sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+        response = self._exchange("hello", token=self.token)
+        if not response.get("ok"):
+            self._disconnect()
+            raise BrokerError(response.get("error", "Broker refused the connection"))
+        self.settings = response.get("settings") or {}
+
+    def _exchange(self, op: str, **fields) -> Dict[str, Any]:
+        self._next_id += 1
+        request = {"op": op, "id": self._next_id}
+        request.update(fields)
+
+        try:
+            send_frame(self._sock, request)
+            return recv_frame(self._sock)
+        except (OSError, ProtocolError):
+            self._disconnect()
+            raise
+
+    def _disconnect(self):
+        if self._sock is not None:
+            try:
+                self._sock.close()
+            finally:
+                self._sock = None
+
+class LeaseHeartbeat:
+    def __init__(self, client: BrokerClient, lease_seconds: int = DEFAULT_LEASE_SECONDS):
+        self.client = client
+        self.lease_seconds = lease_seconds
+        self._job_ids = set()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="queuectl-heartbeat", daemon=True)
+        self._thread.start()
+
+    def track(self, job_ids: List[str]):
+        with self._lock:
+            self._job_ids.update(job_ids)
+
+    def untrack(self, job_ids: List[str]):
+        with self._lock:
+            self._job_ids.difference_update(job_ids)
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(max(self.lease_seconds / 3, 0.5)):
+            with self._lock:
+                job_ids = list(self._job_ids)
+            if not job_ids:
+                continue
+
+            try:
+                lost = self.client.heartbeat(job_ids, self.lease_seconds)
+            except (OSError, ProtocolError, BrokerError) as e:
+                print(f"Heartbeat failed: {e}")
+                continue
+
+            if lost:
+                print(f"Lost lease on job(s): {', '.join(lost)}")
+                self.untrack(lost)
@@ -0,0 +1,431 @@
+import argparse
+import json
+import os
+import re
+import sys
+from typing import List, Optional
+
+STDIN_BATCH_SIZE = 500
+BROKER_TOKEN_ENV = "QUEUECTL_BROKER_TOKEN"
+JSON_LINE = re.compile(r'\{\s*["}]')
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="queuectl", description="QueueCTL job queue")
+    parser.add_argument("--db", default=None, help="Path to the SQLite database (default: .queuectl.db)")
+    commands = parser.add_subparsers(dest="command", metavar="<command>")
+    commands.required = True
+
+    enqueue = commands.add_parser("enqueue", help="Add a job, or a stream of jobs with --stdin")
+    enqueue.add_argument("job_command", nargs="?", help="Shell command to run")
+    enqueue.add_argument("--id", dest="job_id", help="Job ID (auto-generated if omitted)")
+    enqueue.add_argument("--max-retries", type=int, help="Max attempts before the job is moved to the DLQ")
+    enqueue.add_argument("--timeout", type=int, help="Seconds before the job is killed (default: job_timeout config)")
+    enqueue.add_argument("--stdin", action="store_true",
+                         help="Read one job per line from stdin: a plain command or a JSON object "
+                              "with command/id/max_retries/timeout")
+    enqueue.add_argument("--batch-size", type=int, default=STDIN_BATCH_SIZE,
+                         help=f"Jobs per transaction with --stdin (default: {STDIN_BATCH_SIZE})")
+    enqueue.add_argument("--broker", metavar="HOST:PORT", help="Send jobs to a broker instead of the local database")
+    _add_token_option(enqueue)
+    enqueue.set_defaults(handler=cmd_enqueue)
+
+    status = commands.add_parser("status", help="Show job counts and workers")
+    status.add_argument("--json", action="store_true", help="Print machine-readable JSON")
+    status.set_defaults(handler=cmd_status)
+
+    list_parser = commands.add_parser("list", help="List jobs")
+    list_parser.add_argument("--state", choices=["pending", "processing", "completed", "failed", "dead"])
+    list_parser.add_argument("--limit", type=int, help="Maximum number of jobs to show")
+    list_parser.add_argument("--json", action="store_true", help="Print one JSON object per line")
+    list_parser.set_defaults(handler=cmd_list)
+
+    result = commands.add_parser("result", help="Show the stored output of a job")
+    result.add_argument("job_id")
+    result.add_argument("--attempt", type=int, help="Attempt number (default: latest)")
+    result.add_argument("--json", action="store_true", help="Print machine-readable JSON")
+    result.set_defaults(handler=cmd_result)
+
+    dlq = commands.add_parser("dlq", help="Dead letter queue")
+    dlq_commands = dlq.add_subparsers(dest="dlq_command", metavar="<action>")
+    dlq_commands.required = True
+
+    dlq_list = dlq_commands.add_parser("list", help="List dead jobs")
+    dlq_list.add_argument("--limit", type=int, help="Maximum number of jobs to show")
+    dlq_list.add_argument("--json", action="store_true", help="Print one JSON object per line")
+    dlq_list.set_defaults(handler=cmd_dlq_list)
+
+    dlq_groups = dlq_commands.add_parser("groups", help="Count dead jobs by failure fingerprint")
+    dlq_groups.add_argument("--limit", type=int, help="Maximum number of groups to show")
+    dlq_groups.add_argument("--json", action="store_true", help="Print one JSON object per line")
+    dlq_groups.set_defaults(handler=cmd_dlq_groups)
+
+    dlq_retry = dlq_commands.add_parser("retry", help="Re-queue dead jobs by ID or by selector")
+    dlq_retry.add_argument("job_ids", nargs="*", metavar="job_id")
+    _add_dlq_selectors(dlq_retry)
+    dlq_retry.add_argument("--rate", type=float,
+                           help="Release retried jobs back into the queue at this many per second")
+    dlq_retry.set_defaults(handler=cmd_dlq_retry)
+
+    dlq_purge = dlq_commands.add_parser("purge", help="Delete dead jobs by selector")
+    _add_dlq_selectors(dlq_purge)
+    dlq_purge.set_defaults(handler=cmd_dlq_purge)
+
+    workers = commands.add_parser("workers", help="Manage workers")
+    worker_commands = workers.add_subparsers(dest="workers_command", metavar="<action>")
+    worker_commands.required = True
+
+    workers_start = worker_commands.add_parser("start", help="Start workers and wait for them to exit")
+    workers_start.add_argument("--count", type=int, default=1, help="Number of workers (default: 1)")
+    workers_start.add_argument("--profile", action="store_true",
+                               help="Enable slow-query logging, phase timings and profile dumps (SIGUSR1)")
+    workers_start.add_argument("--broker", metavar="HOST:PORT",
+                               help="Pull jobs from a broker instead of the local database")
+    _add_token_option(workers_start)
+    workers_start.set_defaults(handler=cmd_workers_start)
+
+    workers_stop = worker_commands.add_parser("stop", help="Stop running workers")
+    workers_stop.set_defaults(handler=cmd_workers_stop)
+
+    workers_status = worker_commands.add_parser("status", help="Show running workers")
+    workers_status.add_argument("--json", action="store_true", help="Print machine-readable JSON")
+    workers_status.set_defaults(handler=cmd_workers_status)
+
+    broker = commands.add_parser("broker", help="Network job broker")
+    broker_commands = broker.add_subparsers(dest="broker_command", metavar="<action>")
+    broker_commands.required = True
+
+    broker_serve = broker_commands.add_parser("serve", help="Serve the local queue to remote workers")
+    broker_serve.add_argument("--host", default=None, help="Address to bind (default: 127.0.0.1)")
+    broker_serve.add_argument("--port", type=int, default=None, help="Port to bind (default: 7878)")
+    broker_serve.add_argument("--lease", type=int, default=None, help="Default job lease in seconds (default: 60)")
+    broker_serve.set_defaults(handler=cmd_broker_serve)
+
+    broker_token = broker_commands.add_parser("token", help="Print the broker token, creating one if needed")
+    broker_token.add_argument("--rotate", action="store_true", help="Replace the current token with a new one")
+    broker_token.set_defaults(handler=cmd_broker_token)
+
+    return parser
+
+def _add_dlq_selectors(parser: argparse.ArgumentParser):
+    parser.add_argument("--group", metavar="FINGERPRINT", help="Only jobs in this failure group (see 'dlq groups')")
+    parser.add_argument("--since", metavar="TIMESTAMP", help="Only jobs that died at or after this ISO-8601 time")
+    parser.add_argument("--until", metavar="TIMESTAMP", help="Only jobs that died before this ISO-8601 time")
+    parser.add_argument("--pattern", help="SQL LIKE pattern matched against the command or error message")
+    parser.add_argument("--all", action="store_true", help="Select every dead job")
+
+def _add_token_option(parser: argparse.ArgumentParser):
+    parser.add_argument("--token", help=f"Broker token (default: ${BROKER_TOKEN_ENV})")
+
+def _broker_token(args) -> Optional[str]:
+    return args.token or os.environ.get(BROKER_TOKEN_ENV)
+
+def _has_dlq_selector(args) -> bool:
+    return bool(args.group or args.since or args.until or args.pattern or args.all)
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.handler(args) or 0
+
+def _open_storage(args):
+    from .storage import Storage
+    from .models import Config
+
+    return Storage(args.db or Config.DEFAULT_DB_PATH)
+
+def _queue_manager(args):
+    from .queue import QueueManager
+
+    storage = _open_storage(args)
+    return QueueManager(storage, storage.load_config())
+
+def _worker_manager(args):
+    from .worker import WorkerManager
+
+    return WorkerManager(_open_storage(args).load_config())
+
+def cmd_enqueue(args) -> int:
+    if not args.broker:
+        return _enqueue(_queue_manager(args), args)
+
+    from .broker import BrokerClient, BrokerError, parse_address
+    from .protocol import ProtocolError
+
+    host, port = parse_address(args.broker)
+    client = BrokerClient(host, port, _broker_token(args))
+    try:
+        return _enqueue(_RemoteEnqueuer(client), args)
+    except (OSError, BrokerError, ProtocolError) as e:
+        print(f"Error: broker {args.broker}: {e}", file=sys.stderr)
+        return 1
+    finally:
+        client.close()
+
+def _enqueue(queue_manager, args) -> int:
+    if args.stdin:
+        return _enqueue_stream(queue_manager, sys.stdin, args)
+
+    if not args.job_command:
+        print("Error: a command is required unless --stdin is given", file=sys.stderr)
+        return 2
+
+    try:
+        job = queue_manager.enqueue_batch([{
+            "command": args.job_command,
+            "id": args.job_id,
+            "max_retries": args.max_retries,
+            "timeout": args.timeout,
+        }])[0]
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+    print(job.id)
+    return 0
+
+class _RemoteEnqueuer:
+    def __init__(self, client):
+        self.client = client
+
+    def enqueue_batch(self, entries):
+        from .models import Job
+
+        entries = list(entries)
+        job_ids = self.client.enqueue(entries)
+        return [Job(id=job_id, command=entry["command"]) for job_id, entry in zip(job_ids, entries)]
+
+def _enqueue_stream(queue_manager, stream, args) -> int:
+    from .queue import normalize_job_entry
+
+    batch_size = max(args.batch_size, 1)
+    batch = []
+    total = 0
+
+    for line_number, line in enumerate(stream, 1):
+        line = line.strip()
+        if not line:
+            continue
+
+        if JSON_LINE.match(line):
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError as e:
+                print(f"Error: line {line_number}: invalid JSON ({e})", file=sys.stderr)
+                return 1
+        else:
+            entry = {"command": line}
+
+        try:
+            entry = normalize_job_entry(entry)
+        except ValueError as e:
+            print(f"Error: line {line_number}: {e}", file=sys.stderr)
+            return 1
+
+        if entry["max_retries"] is None:
+            entry["max_retries"] = args.max_retries
+        if entry["timeout"] is None:
+            entry["timeout"] = args.timeout
+        batch.append(entry)
+
+        if len(batch) >= batch_size:
+            total += _flush_batch(queue_manager, batch)
+            batch = []
+
+    if batch:
+        total += _flush_batch(queue_manager, batch)
+
+    print(f"Enqueued {total} job(s)", file=sys.stderr)
+    return 0
+
+def _flush_batch(queue_manager, batch) -> int:
+    jobs = queue_manager.enqueue_batch(batch)
+    sys.stdout.write("".join(f"{job.id}\n" for job in jobs))
+    return len(jobs)
+
+def cmd_status(args) -> int:
+    from .queue import QueueManager
+    from .worker import WorkerManager
+
+    storage = _open_storage(args)
+    config = storage.load_config()
+    status = QueueManager(storage, config).get_status()
+    workers = WorkerManager(config).get_worker_status()
+
+    if args.json:
+        print(json.dumps({"jobs": status, "workers": workers}))
+        return 0
+
+    print(f"Jobs: {status['pending']} pending | {status['processing']} running | {status['completed']} done | {status['failed']} failed | {status['dead']} dead")
+    print(f"Workers: {workers['workers']}" + (f" (PIDs: {', '.join(map(str, workers['pids']))})" if workers['pids'] else ""))
+    return 0
+
+def cmd_list(args) -> int:
+    queue_manager = _queue_manager(args)
+
+    if args.state:
+        jobs = queue_manager.get_jobs_by_state(args.state, args.limit)
+    else:
+        jobs = queue_manager.storage.get_all_jobs(args.limit)
+
+    _print_jobs(jobs, args.json)
+    return 0
+
+def _print_jobs(jobs, as_json: bool):
+    for job in jobs:
+        if as_json:
+            print(json.dumps(job.to_dict()))
+            continue
+
+        print(f"{job.id}\t{job.state}\t{job.attempts}/{job.max_retries}\t{job.command}")
+        if job.error_message:
+            print(f"  Error: {job.error_message[:80]}")
+
+def cmd_result(args) -> int:
+    result = _queue_manager(args).get_job_result(args.job_id, args.attempt)
+    if not result:
+        print(f"No output stored for job {args.job_id}", file=sys.stderr)
+        return 1
+
+    if args.json:
+        print(json.dumps(result.to_dict()))
+        return 0
+
+    sys.stdout.write(result.stdout)
+    sys.stderr.write(result.stderr)
+    return 0
+
+def cmd_dlq_list(args) -> int:
+    from .models import JobState
+
+    _print_jobs(_queue_manager(args).get_jobs_by_state(JobState.DEAD, args.limit), args.json)
+    return 0
+
+def cmd_dlq_groups(args) -> int:
+    groups = _queue_manager(args).get_dlq_groups(args.limit)
+
+    for group in groups:
+        if args.json:
+            print(json.dumps(group))
+            continue
+
+        print(f"{group['fingerprint']}\t{group['count']}\t{group['first_seen']} .. {group['last_seen']}")
+        print(f"  Command: {(group['command'] or '')[:60]}")
+        print(f"  Error: {(group['error_message'] or '')[:80]}")
+    return 0
+
+def cmd_dlq_retry(args) -> int:
+    if args.rate is not None and not args.rate > 0:
+        print("Error: --rate must be greater than 0", file=sys.stderr)
+        return 2
+
+    queue_manager = _queue_manager(args)
+
+    if _has_dlq_selector(args):
+        if args.job_ids:
+            print("Error: pass job IDs or selectors, not both", file=sys.stderr)
+            return 2
+        count = queue_manager.retry_dlq_jobs(args.group, args.since, args.until, args.pattern, args.rate)
+        print(f"Re-queued {count} job(s)" + (f" at {args.rate:g}/s" if args.rate else ""))
+        return 0
+
+    if not args.job_ids:
+        print("Error: pass job IDs, a selector (--group/--since/--until/--pattern) or --all", file=sys.stderr)
+        return 2
+
+    failed = 0
+
+    for job_id in args.job_ids:
+        if queue_manager.retry_dlq_job(job_id):
+            print(f"Re-queued {job_id}")
+        else:
+            print(f"Not found in DLQ: {job_id}", file=sys.stderr)
+            failed += 1
+
+    return 1 if failed else 0
+
+def cmd_dlq_purge(args) -> int:
+    if not _has_dlq_selector(args):
+        print("Error: pass a selector (--group/--since/--until/--pattern) or --all", file=sys.stderr)
+        return 2
+
+    count = _queue_manager(args).purge_dlq_jobs(args.group, args.since, args.until, args.pattern)
+    print(f"Purged {count} job(s)")
+    return 0
+
+def cmd_workers_start(args) -> int:
+    import multiprocessing
+
+    if args.count < 1:
+        print("Error: --count must be at least 1", file=sys.stderr)
+        return 2
+
+    if args.broker and args.profile:
+        print("Error: --profile only applies to local workers; it cannot be combined with --broker", file=sys.stderr)
+        return 2
+
+    if args.broker:
+        from .models import Config
+        from .worker import WorkerManager
+
+        worker_manager = WorkerManager(Config(), args.broker, _broker_token(args))
+    else:
+        worker_manager = _worker_manager(args)
+    if args.profile:
+        worker_manager.config.profile_enabled = True
+    if not worker_manager.start_workers(args.count):
+        return 1
+
+    for process in multiprocessing.active_children():
+        process.join()
+    return 0
+
+def cmd_workers_stop(args) -> int:
+    _worker_manager(args).stop_workers()
+    return 0
+
+def cmd_workers_status(args) -> int:
+    status = _worker_manager(args).get_worker_status()
+
+    if args.json:
+        print(json.dumps(status))
+    else:
+        print(f"Workers: {status['workers']}" + (f" (PIDs: {', '.join(map(str, status['pids']))})" if status['pids'] else ""))
+    return 0
+
+def cmd_broker_serve(args) -> int:
+    from .broker import JobBroker, DEFAULT_HOST, DEFAULT_PORT, DEFAULT_LEASE_SECONDS
+    from .queue import QueueManager
+    from .writebehind import WriteBehindBuffer
+
+    storage = _open_storage(args)
+    config = storage.load_config()
+    write_buffer = None
+    if config.commit_interval_ms > 0:
+        write_buffer = WriteBehindBuffer(storage, config.commit_interval_ms, config.commit_batch_size)
+
+    try:
+        broker = JobBroker(
+            QueueManager(storage, config, write_buffer),
+            host=args.host or DEFAULT_HOST,
+            port=args.port if args.port is not None else DEFAULT_PORT,
+            lease_seconds=args.lease or DEFAULT_LEASE_SECONDS,
+            token=config.broker_token,
+        )
+        broker.run()
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+    finally:
+        if write_buffer:
+            write_buffer.close()
+    return 0
+
+def cmd_broker_token(args) -> int:
+    from .broker import generate_token
+
+    storage = _open_storage(args)
+    token = storage.get_config("broker_token", "")
+    if args.rotate or not token:
+        token = generate_token()
+        storage.save_config("broker_token", token)
+
+    print(token)
+    return 0
@@ -1,28 +1,204 @@
+import os
+import signal
 import subprocess
-from typing import Tuple
+import threading
+import time
+from typing import Optional, Tuple
+
+class ExecutionResult:
+    def __init__(
+        self,
+        success: bool,
+        message: str,
+        exit_code: Optional[int] = None,
+        stdout: str = "",
+        stderr: str = "",
+        interrupted: bool = False,
+        stdout_size: int = 0,
+        stderr_size: int = 0,
+    ):
+        self.success = success
+        self.message = message
+        self.exit_code = exit_code
+        self.stdout = stdout
+        self.stderr = stderr
+        self.interrupted = interrupted
+        self.stdout_size = stdout_size
+        self.stderr_size = stderr_size
+
+class OutputTail:
+    CHUNK_SIZE = 64 * 1024
+
+    def __init__(self, stream, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._data = bytearray()
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._read, args=(stream,), daemon=True)
+        self._thread.start()
+
+    def join(self, timeout: Optional[float] = None) -> bool:
+        self._thread.join(timeout)
+        return not self._thread.is_alive()
+
+    def text(self) -> str:
+        with self._lock:
+            return bytes(self._data).decode("utf-8", errors="replace")
+
+    def _read(self, stream):
+        try:
+            while True:
+                chunk = stream.read1(self.CHUNK_SIZE)
+                if not chunk:
+                    return
+                with self._lock:
+                    self.size += len(chunk)
+                    self._data += chunk
+                    if len(self._data) > self.max_bytes:
+                        del self._data[:len(self._data) - self.max_bytes]
+        except (OSError, ValueError):
+            pass
+        finally:
+            stream.close()
 
 class JobExecutor:
-    @staticmethod
-    def execute(command: str, timeout: int = 300) -> Tuple[bool, str]:
+    DEFAULT_TIMEOUT = 300
+    DEFAULT_KILL_GRACE = 5
+    DEFAULT_OUTPUT_MAX_BYTES = 64 * 1024
+    MESSAGE_TAIL_BYTES = 4096
+    POLL_INTERVAL = 0.5
+    LIMIT_EXIT_CODE = 126
+
+    def __init__(
+        self,
+        timeout: int = DEFAULT_TIMEOUT,
+        kill_grace: float = DEFAULT_KILL_GRACE,
+        cpu_seconds: int = 0,
+        memory_mb: int = 0,
+        open_files: int = 0,
+        output_max_bytes: int = DEFAULT_OUTPUT_MAX_BYTES,
+    ):
+        self.timeout = timeout
+        self.kill_grace = kill_grace
+        self.cpu_seconds = cpu_seconds
+        self.memory_mb = memory_mb
+        self.open_files = open_files
+        self.output_max_bytes = output_max_bytes
+        self._stop_requested = False
+
+    def execute(self, command: str, timeout: Optional[int] = None) -> Tuple[bool, str]:
+        result = self.run(command, timeout)
+        return result.success, result.message
+
+    def request_stop(self):
+        self._stop_requested = True
+
+    def run(self, command: str, timeout: Optional[int] = None) -> ExecutionResult:
         try:
-            result = subprocess.run(
-                command,
+            process = subprocess.Popen(
+                self._limit_prologue() + command,
                 shell=True,
-                capture_output=True,
-                text=True,
-                timeout=timeout,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                start_new_session=os.name == "posix",
             )
+        except FileNotFoundError as e:
+            return ExecutionResult(False, f"Command not found: {str(e)}")
+        except Exception as e:
+            return ExecutionResult(False, f"Execution error: {str(e)}")
 
-            if result.returncode == 0:
-                output = result.stdout.strip() if result.stdout else "Command completed successfully"
-                return True, output
-            else:
-                error = result.stderr.strip() if result.stderr else f"Command failed with exit code {result.returncode}"
-                return False, error
+        max_bytes = max(self.output_max_bytes, self.MESSAGE_TAIL_BYTES)
+        outputs = (OutputTail(process.stdout, max_bytes), OutputTail(process.stderr, max_bytes))
 
-        except subprocess.TimeoutExpired:
-            return False, f"Command timed out after {timeout} seconds"
-        except FileNotFoundError as e:
-            return False, f"Command not found: {str(e)}"
+        try:
+            if timeout is None or timeout <= 0:
+                timeout = self.timeout
+            deadline = time.monotonic() + timeout
+            while not self._wait(process, outputs, self.POLL_INTERVAL):
+                if self._stop_requested:
+                    self._kill_group(process, outputs)
+                    return self._result(
+                        False, "Command interrupted by worker shutdown", process, outputs, interrupted=True,
+                    )
+                if time.monotonic() >= deadline:
+                    self._kill_group(process, outputs)
+                    return self._result(False, f"Command timed out after {timeout} seconds", process, outputs)
         except Exception as e:
-            return False, f"Execution error: {str(e)}"
+            self._kill_group(process, outputs)
+            return ExecutionResult(False, f"Execution error: {str(e)}")
+
+        stdout, stderr = outputs[0].text(), outputs[1].text()
+
+        if process.returncode == 0:
+            output = stdout.strip() if stdout else "Command completed successfully"
+            return self._result(True, output, process, outputs)
+        else:
+            error = stderr.strip() if stderr else f"Command failed with exit code {process.returncode}"
+            return self._result(False, error, process, outputs)
+
+    def _result(
+        self,
+        success: bool,
+        message: str,
+        process: subprocess.Popen,
+        outputs: Tuple[OutputTail, OutputTail],
+        interrupted: bool = False,
+    ) -> ExecutionResult:
+        stdout, stderr = outputs
+        return ExecutionResult(
+            success,
+            message,
+            process.returncode,
+            stdout.text(),
+            stderr.text(),
+            interrupted=interrupted,
+            stdout_size=stdout.size,
+            stderr_size=stderr.size,
+        )
+
+    def _wait(self, process: subprocess.Popen, outputs: Tuple[OutputTail, ...], timeout: float) -> bool:
+        deadline = time.monotonic() + timeout
+        try:
+            process.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            return False
+        return all(output.join(max(deadline - time.monotonic(), 0)) for output in outputs)
+
+    def _kill_group(self, process: subprocess.Popen, outputs: Tuple[OutputTail, ...]):
+        self._signal_group(process, signal.SIGTERM)
+
+        if not self._wait(process, outputs, self.kill_grace):
+            self._signal_group(process, getattr(signal, "SIGKILL", signal.SIGTERM))
+            if not self._wait(process, outputs, self.kill_grace):
+                process.kill()
+                process.wait()
+                return
+
+        self._signal_group(process, getattr(signal, "SIGKILL", signal.SIGTERM))
+
+    def _signal_group(self, process: subprocess.Popen, signum: int):
+        try:
+            if hasattr(os, "killpg"):
+                os.killpg(process.pid, signum)
+            elif process.poll() is None:
+                process.send_signal(signum)
+        except (ProcessLookupError, PermissionError):
+            pass
+
+    def _has_limits(self) -> bool:
+        return os.name == "posix" and bool(self.cpu_seconds or self.memory_mb or self.open_files)
+
+    def _limit_prologue(self) -> str:
+        if not self._has_limits():
+            return ""
+
+        commands = []
+        if self.cpu_seconds:
+            commands.append(f"ulimit -S -t {int(self.cpu_seconds)}")
+            commands.append(f"ulimit -H -t {int(self.cpu_seconds) + 1}")
+        if self.memory_mb:
+            commands.append(f"ulimit -v {int(self.memory_mb) * 1024}")
+        if self.open_files:
+            commands.append(f"ulimit -n {int(self.open_files)}")
+
+        return " && ".join(commands) + f" || exit {self.LIMIT_EXIT_CODE}\n"
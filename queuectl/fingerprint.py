@@ -0,0 +1,24 @@
+import hashlib
+import re
+
+MAX_NORMALIZED_LENGTH = 500
+
+_PATTERNS = [
+    (re.compile(r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}", re.IGNORECASE), "<uuid>"),
+    (re.compile(r"\d{4}-\d{2}-\d{2}[t ]\d{2}:\d{2}:\d{2}(\.\d+)?(z|[+-]\d{2}:?\d{2})?", re.IGNORECASE), "<ts>"),
+    (re.compile(r"\b0x[0-9a-f]+\b|\b[0-9a-f]{8,}\b", re.IGNORECASE), "<hex>"),
+    (re.compile(r"\"[^\"]*\"|'[^']*'"), "<str>"),
+    (re.compile(r"(?:/[\w.\-]+){2,}/?"), "<path>"),
+    (re.compile(r"\d+(\.\d+)?"), "<n>"),
+    (re.compile(r"\s+"), " "),
+]
+
+def normalize(text: str) -> str:
+    text = (text or "").strip().lower()
+    for pattern, replacement in _PATTERNS:
+        text = pattern.sub(replacement, text)
+    return text[:MAX_NORMALIZED_LENGTH]
+
+def failure_fingerprint(command: str, error_message: str) -> str:
+    key = f"{normalize(command)}\n{normalize(error_message)}"
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
@@ -22,6 +22,10 @@ class Job:
         updated_at: Optional[str] = None,
         next_retry_at: Optional[str] = None,
         error_message: Optional[str] = None,
+        timeout: Optional[int] = None,
+        fingerprint: Optional[str] = None,
+        backoff_delay: Optional[float] = None,
+        lease_expires_at: Optional[str] = None,
     ):
         self.id = id
         self.command = command
@@ -32,6 +36,10 @@ class Job:
         self.updated_at = updated_at or datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z')
         self.next_retry_at = next_retry_at
         self.error_message = error_message
+        self.timeout = timeout
+        self.fingerprint = fingerprint
+        self.backoff_delay = backoff_delay
+        self.lease_expires_at = lease_expires_at
 
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -44,6 +52,10 @@ class Job:
             "updated_at": self.updated_at,
             "next_retry_at": self.next_retry_at,
             "error_message": self.error_message,
+            "timeout": self.timeout,
+            "fingerprint": self.fingerprint,
+            "backoff_delay": self.backoff_delay,
+            "lease_expires_at": self.lease_expires_at,
         }
 
     def to_json(self) -> str:
@@ -61,6 +73,10 @@ class Job:
             updated_at=data.get("updated_at"),
             next_retry_at=data.get("next_retry_at"),
             error_message=data.get("error_message"),
+            timeout=data.get("timeout"),
+            fingerprint=data.get("fingerprint"),
+            backoff_delay=data.get("backoff_delay"),
+            lease_expires_at=data.get("lease_expires_at"),
         )
 
     @classmethod
@@ -70,19 +86,127 @@ class Job:
     def update_timestamp(self):
         self.updated_at = datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z')
 
+class JobResult:
+    def __init__(
+        self,
+        job_id: str,
+        attempt: int,
+        exit_code: Optional[int] = None,
+        stdout: str = "",
+        stderr: str = "",
+        stdout_size: int = 0,
+        stderr_size: int = 0,
+        truncated: bool = False,
+        created_at: Optional[str] = None,
+    ):
+        self.job_id = job_id
+        self.attempt = attempt
+        self.exit_code = exit_code
+        self.stdout = stdout
+        self.stderr = stderr
+        self.stdout_size = stdout_size
+        self.stderr_size = stderr_size
+        self.truncated = truncated
+        self.created_at = created_at or datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z')
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.job_id,
+            "attempt": self.attempt,
+            "exit_code": self.exit_code,
+            "stdout": self.stdout,
+            "stderr": self.stderr,
+            "stdout_size": self.stdout_size,
+            "stderr_size": self.stderr_size,
+            "truncated": self.truncated,
+            "created_at": self.created_at,
+        }
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), indent=2)
+
 class Config:
     DEFAULT_MAX_RETRIES = 3
     DEFAULT_BACKOFF_BASE = 2
+    DEFAULT_BACKOFF_JITTER = "equal"
+    DEFAULT_BACKOFF_MAX_DELAY = 3600
+    DEFAULT_RETRY_BATCH_SIZE = 500
+    DEFAULT_RESULT_MAX_BYTES = 64 * 1024
+    DEFAULT_JOB_TIMEOUT = 300
+    DEFAULT_KILL_GRACE = 5
+    DEFAULT_PROFILE_SLOW_QUERY_MS = 50
+    DEFAULT_PROFILE_SAMPLE_EVERY = 10
+    DEFAULT_COMMIT_INTERVAL_MS = 50
+    DEFAULT_COMMIT_BATCH_SIZE = 100
+    DEFAULT_DLQ_BATCH_SIZE = 500
     DEFAULT_DB_PATH = ".queuectl.db"
 
-    def __init__(self, max_retries: int = None, backoff_base: int = None, db_path: str = None):
+    JITTER_STRATEGIES = ("none", "full", "equal", "decorrelated")
+
+    def __init__(
+        self,
+        max_retries: int = None,
+        backoff_base: int = None,
+        db_path: str = None,
+        backoff_jitter: str = None,
+        backoff_max_delay: int = None,
+        retry_batch_size: int = None,
+        result_max_bytes: int = None,
+        job_timeout: int = None,
+        kill_grace: int = None,
+        limit_cpu_seconds: int = 0,
+        limit_memory_mb: int = 0,
+        limit_open_files: int = 0,
+        profile_enabled: bool = False,
+        profile_slow_query_ms: float = None,
+        profile_interval: int = 0,
+        profile_sample_every: int = None,
+        commit_interval_ms: int = None,
+        commit_batch_size: int = None,
+        dlq_batch_size: int = None,
+        broker_token: str = "",
+    ):
         self.max_retries = max_retries if max_retries is not None else self.DEFAULT_MAX_RETRIES
         self.backoff_base = backoff_base if backoff_base is not None else self.DEFAULT_BACKOFF_BASE
         self.db_path = db_path if db_path is not None else self.DEFAULT_DB_PATH
+        self.backoff_jitter = backoff_jitter if backoff_jitter is not None else self.DEFAULT_BACKOFF_JITTER
+        self.backoff_max_delay = backoff_max_delay if backoff_max_delay is not None else self.DEFAULT_BACKOFF_MAX_DELAY
+        self.retry_batch_size = retry_batch_size if retry_batch_size is not None else self.DEFAULT_RETRY_BATCH_SIZE
+        self.result_max_bytes = result_max_bytes if result_max_bytes is not None else self.DEFAULT_RESULT_MAX_BYTES
+        self.job_timeout = job_timeout if job_timeout is not None else self.DEFAULT_JOB_TIMEOUT
+        self.kill_grace = kill_grace if kill_grace is not None else self.DEFAULT_KILL_GRACE
+        self.limit_cpu_seconds = limit_cpu_seconds
+        self.limit_memory_mb = limit_memory_mb
+        self.limit_open_files = limit_open_files
+        self.profile_enabled = profile_enabled
+        self.profile_slow_query_ms = profile_slow_query_ms if profile_slow_query_ms is not None else self.DEFAULT_PROFILE_SLOW_QUERY_MS
+        self.profile_interval = profile_interval
+        self.profile_sample_every = profile_sample_every if profile_sample_every is not None else self.DEFAULT_PROFILE_SAMPLE_EVERY
+        self.commit_interval_ms = commit_interval_ms if commit_interval_ms is not None else self.DEFAULT_COMMIT_INTERVAL_MS
+        self.commit_batch_size = commit_batch_size if commit_batch_size is not None else self.DEFAULT_COMMIT_BATCH_SIZE
+        self.dlq_batch_size = dlq_batch_size if dlq_batch_size is not None else self.DEFAULT_DLQ_BATCH_SIZE
+        self.broker_token = broker_token
 
     def to_dict(self) -> Dict[str, Any]:
         return {
             "max_retries": self.max_retries,
             "backoff_base": self.backoff_base,
             "db_path": self.db_path,
+            "backoff_jitter": self.backoff_jitter,
+            "backoff_max_delay": self.backoff_max_delay,
+            "retry_batch_size": self.retry_batch_size,
+            "result_max_bytes": self.result_max_bytes,
+            "job_timeout": self.job_timeout,
+            "kill_grace": self.kill_grace,
+            "limit_cpu_seconds": self.limit_cpu_seconds,
+            "limit_memory_mb": self.limit_memory_mb,
+            "limit_open_files": self.limit_open_files,
+            "profile_enabled": self.profile_enabled,
+            "profile_slow_query_ms": self.profile_slow_query_ms,
+            "profile_interval": self.profile_interval,
+            "profile_sample_every": self.profile_sample_every,
+            "commit_interval_ms": self.commit_interval_ms,
+            "commit_batch_size": self.commit_batch_size,
+            "dlq_batch_size": self.dlq_batch_size,
+            "broker_token": self.broker_token,
         }
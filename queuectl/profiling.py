@@ -0,0 +1,230 @@
+import cProfile
+import functools
+import inspect
+import logging
+import os
+import signal
+import sqlite3
+import sys
+import threading
+import time
+import tracemalloc
+from typing import Dict
+from .models import Config
+
+logger = logging.getLogger("queuectl.profile")
+
+class _SqlTimes(threading.local):
+    def __init__(self):
+        self.lock_wait = 0.0
+        self.commit = 0.0
+        self.depth = 0
+
+_sql_times = _SqlTimes()
+_stats_lock = threading.Lock()
+
+WRITE_STATEMENTS = ("INSERT", "UPDATE", "DELETE", "REPLACE")
+
+class TimedCursor(sqlite3.Cursor):
+    def execute(self, sql, parameters=()):
+        if sql.lstrip()[:5].upper() == "BEGIN":
+            return self._timed_begin(sql, parameters)
+        self._begin_write(sql)
+        return super().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        self._begin_write(sql)
+        return super().executemany(sql, seq_of_parameters)
+
+    def _begin_write(self, sql: str):
+        if not self.connection.in_transaction and sql.lstrip()[:7].upper().startswith(WRITE_STATEMENTS):
+            self._timed_begin("BEGIN IMMEDIATE")
+
+    def _timed_begin(self, sql: str, parameters=()):
+        start = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            _sql_times.lock_wait += time.perf_counter() - start
+
+class TimedConnection(sqlite3.Connection):
+    def cursor(self, factory=TimedCursor):
+        return super().cursor(factory)
+
+    def commit(self):
+        start = time.perf_counter()
+        try:
+            return super().commit()
+        finally:
+            _sql_times.commit += time.perf_counter() - start
+
+def instrument_storage(storage, slow_query_ms: float) -> Dict[str, Dict[str, float]]:
+    stats = {}
+    storage.connection_factory = TimedConnection
+
+    for name in dir(type(storage)):
+        if name.startswith("_"):
+            continue
+        method = getattr(storage, name)
+        if inspect.ismethod(method):
+            setattr(storage, name, _timed(name, method, slow_query_ms / 1000.0, stats))
+
+    return stats
+
+def _timed(name: str, method, threshold: float, stats: Dict[str, Dict[str, float]]):
+    entry = stats.setdefault(
+        name,
+        {"calls": 0, "total_ms": 0.0, "max_ms": 0.0, "lock_wait_ms": 0.0, "commit_ms": 0.0},
+    )
+
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        if _sql_times.depth:
+            return method(*args, **kwargs)
+
+        lock_wait_before = _sql_times.lock_wait
+        commit_before = _sql_times.commit
+        start = time.perf_counter()
+        _sql_times.depth += 1
+        try:
+            return method(*args, **kwargs)
+        finally:
+            _sql_times.depth -= 1
+            elapsed = time.perf_counter() - start
+            lock_wait = _sql_times.lock_wait - lock_wait_before
+            commit = _sql_times.commit - commit_before
+
+            with _stats_lock:
+                entry["calls"] += 1
+                entry["total_ms"] += elapsed * 1000
+                entry["max_ms"] = max(entry["max_ms"], elapsed * 1000)
+                entry["lock_wait_ms"] += lock_wait * 1000
+                entry["commit_ms"] += commit * 1000
+
+            if elapsed >= threshold:
+                logger.warning(
+                    "slow storage call %s: %.1fms (lock wait %.1fms, commit %.1fms)",
+                    name, elapsed * 1000, lock_wait * 1000, commit * 1000,
+                )
+
+    return wrapper
+
+class WorkerProfiler:
+    PROFILE_DIR = ".queuectl_profiles"
+    PHASES = ("claim", "exec", "persist", "flush")
+
+    def __init__(self, worker_id: int, config: Config, storage, write_buffer=None):
+        self.worker_id = worker_id
+        self.write_buffer = write_buffer
+        self.interval = config.profile_interval
+        self.sample_every = max(config.profile_sample_every, 1)
+        self.storage_stats = instrument_storage(storage, config.profile_slow_query_ms)
+
+        self.profile = cProfile.Profile()
+        self.iterations = 0
+        self.phase_totals = {phase: 0.0 for phase in self.PHASES}
+        self.phase_current = {}
+        self.memory = None
+        self._flushed = 0.0
+        self._sampling = False
+        self._last_mark = 0.0
+        self._dump_requested = False
+        self._next_dump = time.monotonic() + self.interval if self.interval > 0 else None
+
+        if hasattr(signal, "SIGUSR1"):
+            signal.signal(signal.SIGUSR1, self._request_dump)
+
+    def begin(self):
+        self.iterations += 1
+        self.phase_current = {}
+        self._sampling = self.iterations % self.sample_every == 0
+        if self._sampling:
+            tracemalloc.start()
+            self.profile.enable()
+        self._last_mark = time.perf_counter()
+
+    def mark(self, phase: str):
+        now = time.perf_counter()
+        self.phase_current[phase] = self.phase_current.get(phase, 0.0) + now - self._last_mark
+        self._last_mark = now
+
+    def end(self):
+        if self._sampling:
+            self.profile.disable()
+            self.memory = tracemalloc.take_snapshot()
+            tracemalloc.stop()
+            self._sampling = False
+
+        if self.write_buffer:
+            flushed = self.write_buffer.background_seconds
+            if flushed > self._flushed:
+                self.phase_current["flush"] = flushed - self._flushed
+            self._flushed = flushed
+
+        for phase, seconds in self.phase_current.items():
+            self.phase_totals[phase] = self.phase_totals.get(phase, 0.0) + seconds
+
+        if "exec" in self.phase_current:
+            logger.info(
+                "worker %s iteration %s: %s",
+                self.worker_id,
+                self.iterations,
+                " ".join(f"{phase}={seconds * 1000:.1f}ms" for phase, seconds in self.phase_current.items()),
+            )
+
+        if self._dump_requested or (self._next_dump is not None and time.monotonic() >= self._next_dump):
+            self.dump()
+
+    def close(self):
+        self.dump()
+
+    def dump(self) -> str:
+        self._dump_requested = False
+        if self.interval > 0:
+            self._next_dump = time.monotonic() + self.interval
+
+        os.makedirs(self.PROFILE_DIR, exist_ok=True)
+        prefix = os.path.join(
+            self.PROFILE_DIR,
+            f"worker-{self.worker_id}-{os.getpid()}-{time.strftime('%Y%m%d-%H%M%S')}",
+        )
+
+        self.profile.dump_stats(f"{prefix}.prof")
+
+        with open(f"{prefix}.txt", "w") as f:
+            f.write(f"iterations: {self.iterations}\n\n")
+            f.write("phases:\n")
+            for phase, seconds in self.phase_totals.items():
+                f.write(f"  {phase:<10} {seconds * 1000:12.1f}ms\n")
+
+            with _stats_lock:
+                storage_stats = {name: dict(entry) for name, entry in self.storage_stats.items()}
+
+            f.write("\nstorage:\n")
+            for name, entry in sorted(storage_stats.items(), key=lambda item: -item[1]["total_ms"]):
+                if entry["calls"]:
+                    f.write(
+                        f"  {name:<28} calls={entry['calls']:<8} total={entry['total_ms']:.1f}ms "
+                        f"max={entry['max_ms']:.1f}ms lock_wait={entry['lock_wait_ms']:.1f}ms "
+                        f"commit={entry['commit_ms']:.1f}ms\n"
+                    )
+
+            if self.memory:
+                f.write("\nmemory (last sampled iteration, top 25 by line):\n")
+                for stat in self.memory.statistics("lineno")[:25]:
+                    f.write(f"  {stat}\n")
+
+        logger.info("worker %s profile written to %s.prof/.txt", self.worker_id, prefix)
+        return prefix
+
+    def _request_dump(self, signum, frame):
+        self._dump_requested = True
+
+def create_worker_profiler(worker_id: int, config: Config, storage, write_buffer=None) -> WorkerProfiler:
+    if not logger.handlers:
+        handler = logging.StreamHandler(sys.stderr)
+        handler.setFormatter(logging.Formatter("%(asctime)s %(name)s %(levelname)s %(message)s"))
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+
+    return WorkerProfiler(worker_id, config, storage, write_buffer)
@@ -0,0 +1,55 @@
+import json
+import socket
+import struct
+from typing import Any, Dict
+
+HEADER = struct.Struct("!I")
+MAX_FRAME_SIZE = 16 * 1024 * 1024
+
+class ProtocolError(Exception):
+    pass
+
+def encode_frame(message: Dict[str, Any]) -> bytes:
+    body = json.dumps(message, separators=(",", ":")).encode("utf-8")
+    if len(body) > MAX_FRAME_SIZE:
+        raise ProtocolError(f"Frame of {len(body)} bytes exceeds {MAX_FRAME_SIZE}")
+    return HEADER.pack(len(body)) + body
+
+def decode_body(body: bytes) -> Dict[str, Any]:
+    try:
+        message = json.loads(body.decode("utf-8"))
+    except (UnicodeDecodeError, json.JSONDecodeError) as e:
+        raise ProtocolError(f"Malformed frame: {e}")
+
+    if not isinstance(message, dict):
+        raise ProtocolError("Frame must contain a JSON object")
+    return message
+
+def check_length(length: int):
+    if length > MAX_FRAME_SIZE:
+        raise ProtocolError(f"Frame of {length} bytes exceeds {MAX_FRAME_SIZE}")
+
+async def read_frame(reader) -> Dict[str, Any]:
+    header = await reader.readexactly(HEADER.size)
+    (length,) = HEADER.unpack(header)
+    check_length(length)
+    return decode_body(await reader.readexactly(length))
+
+def send_frame(sock: socket.socket, message: Dict[str, Any]):
+    sock.sendall(encode_frame(message))
+
+def recv_frame(sock: socket.socket) -> Dict[str, Any]:
+    (length,) = HEADER.unpack(_recv_exactly(sock, HEADER.size))
+    check_length(length)
+    return decode_body(_recv_exactly(sock, length))
+
+def _recv_exactly(sock: socket.socket, size: int) -> bytes:
+    chunks = []
+    remaining = size
+    while remaining:
+        chunk = sock.recv(min(remaining, 65536))
+        if not chunk:
+            raise ConnectionError("Broker closed the connection")
+        chunks.append(chunk)
+        remaining -= len(chunk)
+    return b"".join(chunks)
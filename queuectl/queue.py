@@ -1,71 +1,168 @@
 import uuid
+import random
 from datetime import datetime, timedelta, timezone
-from typing import Optional, List
-from .models import Job, JobState, Config
+from typing import Optional, List, Iterable, Dict, Any, Tuple
+from .models import Job, JobResult, JobState, Config
 from .storage import Storage
-from .executor import JobExecutor
+from .executor import JobExecutor, ExecutionResult
+from .writebehind import WriteBehindBuffer
+from .fingerprint import failure_fingerprint
+
+def normalize_job_entry(entry: Dict[str, Any]) -> Dict[str, Any]:
+    if not isinstance(entry, dict):
+        raise ValueError("expected a JSON object")
+
+    command = entry.get("command")
+    if not command:
+        raise ValueError("missing 'command'")
+    if not isinstance(command, str):
+        raise ValueError(f"'command' must be a string, got {command!r}")
+
+    job_id = entry.get("id")
+    if isinstance(job_id, bool) or not isinstance(job_id, (str, int, type(None))):
+        raise ValueError(f"'id' must be a string, got {job_id!r}")
+
+    return {
+        "command": command,
+        "id": str(job_id) if job_id not in (None, "") else None,
+        "max_retries": _integer_field(entry, "max_retries", 0),
+        "timeout": _integer_field(entry, "timeout", 1),
+    }
+
+def _integer_field(entry: Dict[str, Any], field: str, minimum: int) -> Optional[int]:
+    value = entry.get(field)
+    if value is None:
+        return None
+
+    try:
+        if isinstance(value, bool) or not isinstance(value, (int, str)):
+            raise ValueError
+        number = int(value)
+    except ValueError:
+        raise ValueError(f"'{field}' must be an integer, got {value!r}") from None
+
+    if number < minimum:
+        raise ValueError(f"'{field}' must be at least {minimum}, got {number}")
+    return number
 
 class QueueManager:
-    def __init__(self, storage: Storage, config: Config):
+    ERROR_MESSAGE_MAX_LENGTH = 1000
+
+    def __init__(self, storage: Storage, config: Config, write_buffer: Optional[WriteBehindBuffer] = None):
         self.storage = storage
         self.config = config
-        self.executor = JobExecutor()
-
-    def enqueue(self, command: str, job_id: Optional[str] = None, max_retries: Optional[int] = None) -> Job:
-        if not job_id:
-            job_id = self._generate_job_id()
+        self.write_buffer = write_buffer
+        self.executor = JobExecutor(
+            timeout=config.job_timeout,
+            kill_grace=config.kill_grace,
+            cpu_seconds=config.limit_cpu_seconds,
+            memory_mb=config.limit_memory_mb,
+            open_files=config.limit_open_files,
+            output_max_bytes=config.result_max_bytes,
+        )
 
-        if max_retries is None:
-            max_retries = self.config.max_retries
+    def enqueue(
+        self,
+        command: str,
+        job_id: Optional[str] = None,
+        max_retries: Optional[int] = None,
+        timeout: Optional[int] = None,
+    ) -> Job:
+        entry = normalize_job_entry({
+            "command": command,
+            "id": job_id,
+            "max_retries": max_retries,
+            "timeout": timeout,
+        })
+        max_retries = entry["max_retries"]
 
         job = Job(
-            id=job_id,
-            command=command,
+            id=entry["id"] or self._generate_job_id(),
+            command=entry["command"],
             state=JobState.PENDING,
-            max_retries=max_retries,
+            max_retries=max_retries if max_retries is not None else self.config.max_retries,
+            timeout=entry["timeout"],
         )
 
         self.storage.save_job(job)
         return job
 
+    def enqueue_batch(self, entries: Iterable[Dict[str, Any]]) -> List[Job]:
+        jobs = []
+        for entry in entries:
+            entry = normalize_job_entry(entry)
+            max_retries = entry["max_retries"]
+            jobs.append(Job(
+                id=entry["id"] or self._generate_job_id(),
+                command=entry["command"],
+                state=JobState.PENDING,
+                max_retries=max_retries if max_retries is not None else self.config.max_retries,
+                timeout=entry["timeout"],
+            ))
+
+        if jobs:
+            self.storage.save_jobs(jobs)
+        return jobs
+
     def process_job(self, job: Job) -> bool:
-        success, message = self.executor.execute(job.command)
+        return self.record_result(job, self.execute_job(job))
+
+    def execute_job(self, job: Job) -> ExecutionResult:
+        return self.executor.run(job.command, job.timeout)
+
+    def record_result(self, job: Job, result: ExecutionResult) -> bool:
+        job.lease_expires_at = None
+
+        if result.interrupted:
+            job.state = JobState.PENDING
+            job.update_timestamp()
+            self._persist(job, ("state", "lease_expires_at", "updated_at"))
+            return False
+
+        job_result = self._build_result(job, result)
 
-        if success:
+        if result.success:
             job.state = JobState.COMPLETED
             job.error_message = None
             job.update_timestamp()
-            self.storage.save_job(job)
+            self._persist(job, ("state", "error_message", "lease_expires_at", "updated_at"), job_result)
             return True
         else:
             job.attempts += 1
-            job.error_message = message
+            job.error_message = result.message[-self.ERROR_MESSAGE_MAX_LENGTH:]
             job.update_timestamp()
 
             if job.attempts >= job.max_retries:
                 job.state = JobState.DEAD
                 job.next_retry_at = None
+                job.fingerprint = failure_fingerprint(job.command, job.error_message)
             else:
                 job.state = JobState.FAILED
-                delay_seconds = self._calculate_backoff(job.attempts)
-                job.next_retry_at = self._calculate_next_retry(delay_seconds)
+                job.backoff_delay = self._calculate_backoff(job.attempts, job.backoff_delay)
+                job.next_retry_at = self._calculate_next_retry(job.backoff_delay)
 
-            self.storage.save_job(job)
+            self._persist(
+                job,
+                (
+                    "state", "attempts", "error_message", "next_retry_at", "fingerprint",
+                    "backoff_delay", "lease_expires_at", "updated_at",
+                ),
+                job_result,
+            )
             return False
 
     def get_next_job(self) -> Optional[Job]:
         current_time = datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z')
-        retryable_jobs = self.storage.get_retryable_jobs(current_time)
-
-        if retryable_jobs:
-            job = retryable_jobs[0]
-            job.state = JobState.PENDING
-            job.next_retry_at = None
-            job.update_timestamp()
-            self.storage.save_job(job)
+        self.storage.promote_retryable_jobs(current_time, self.config.retry_batch_size)
 
         return self.storage.get_pending_job()
 
+    def claim_jobs(self, limit: int, lease_expires_at: Optional[str] = None) -> List[Job]:
+        current_time = datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z')
+        self.storage.promote_retryable_jobs(current_time, self.config.retry_batch_size)
+
+        return self.storage.claim_pending_jobs(limit, lease_expires_at)
+
     def retry_dlq_job(self, job_id: str) -> bool:
         job = self.storage.get_job(job_id)
 
@@ -76,17 +173,49 @@ class QueueManager:
         job.attempts = 0
         job.error_message = None
         job.next_retry_at = None
+        job.fingerprint = None
+        job.backoff_delay = None
         job.update_timestamp()
 
         self.storage.save_job(job)
         return True
 
-    def get_jobs_by_state(self, state: str) -> List[Job]:
-        return self.storage.get_jobs_by_state(state)
+    def get_dlq_groups(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        self.storage.backfill_fingerprints(failure_fingerprint, self.config.dlq_batch_size)
+        return self.storage.get_dlq_groups(limit)
+
+    def retry_dlq_jobs(
+        self,
+        fingerprint: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        pattern: Optional[str] = None,
+        rate: Optional[float] = None,
+    ) -> int:
+        if fingerprint:
+            self.storage.backfill_fingerprints(failure_fingerprint, self.config.dlq_batch_size)
+        return self.storage.retry_dead_jobs(fingerprint, since, until, pattern, self.config.dlq_batch_size, rate)
+
+    def purge_dlq_jobs(
+        self,
+        fingerprint: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        pattern: Optional[str] = None,
+    ) -> int:
+        if fingerprint:
+            self.storage.backfill_fingerprints(failure_fingerprint, self.config.dlq_batch_size)
+        return self.storage.purge_dead_jobs(fingerprint, since, until, pattern, self.config.dlq_batch_size)
+
+    def get_jobs_by_state(self, state: str, limit: Optional[int] = None) -> List[Job]:
+        return self.storage.get_jobs_by_state(state, limit)
 
     def get_job(self, job_id: str) -> Optional[Job]:
         return self.storage.get_job(job_id)
 
+    def get_job_result(self, job_id: str, attempt: Optional[int] = None) -> Optional[JobResult]:
+        return self.storage.get_job_result(job_id, attempt)
+
     def get_status(self) -> dict:
         counts = self.storage.get_job_counts()
         return {
@@ -98,12 +227,51 @@ class QueueManager:
             "total": sum(counts.values()),
         }
 
+    def _build_result(self, job: Job, result: ExecutionResult) -> Optional[JobResult]:
+        if self.config.result_max_bytes <= 0:
+            return None
+
+        return JobResult(
+            job_id=job.id,
+            attempt=job.attempts + 1,
+            exit_code=result.exit_code,
+            stdout=result.stdout,
+            stderr=result.stderr,
+            stdout_size=result.stdout_size,
+            stderr_size=result.stderr_size,
+        )
+
+    def _persist(self, job: Job, columns: Tuple[str, ...], job_result: Optional[JobResult] = None) -> None:
+        fields = {column: getattr(job, column) for column in columns}
+        results = [(job_result, self.config.result_max_bytes)] if job_result else []
+
+        if self.write_buffer:
+            self.write_buffer.add(job.id, fields, results)
+        else:
+            self.storage.apply_job_updates([(job.id, fields)], results)
+
     def _generate_job_id(self) -> str:
         return f"job-{uuid.uuid4().hex[:12]}"
 
-    def _calculate_backoff(self, attempts: int) -> int:
-        return self.config.backoff_base ** attempts
+    def _calculate_backoff(self, attempts: int, previous_delay: Optional[float] = None) -> float:
+        base = self.config.backoff_base
+        delay = self._cap_delay(base ** attempts)
+        jitter = self.config.backoff_jitter
+
+        if jitter == "full":
+            return random.uniform(0, delay)
+        if jitter == "equal":
+            return delay / 2 + random.uniform(0, delay / 2)
+        if jitter == "decorrelated":
+            previous = previous_delay if previous_delay else base
+            return self._cap_delay(random.uniform(base, max(previous * 3, base)))
+        return delay
+
+    def _cap_delay(self, delay: float) -> float:
+        if self.config.backoff_max_delay and self.config.backoff_max_delay > 0:
+            return min(delay, self.config.backoff_max_delay)
+        return delay
 
-    def _calculate_next_retry(self, delay_seconds: int) -> str:
+    def _calculate_next_retry(self, delay_seconds: float) -> str:
         next_retry = datetime.now(timezone.utc) + timedelta(seconds=delay_seconds)
         return next_retry.isoformat().replace('+00:00', 'Z')
@@ -1,10 +1,28 @@
 import sqlite3
 import json
-from typing import List, Optional, Dict, Any
+import zlib
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional, Dict, Any, Tuple
 from contextlib import contextmanager
-from .models import Job, JobState, Config
+from .models import Job, JobResult, JobState, Config
 
 class Storage:
+    SCHEMA_VERSION = 5
+
+    connection_factory = sqlite3.Connection
+
+    INSERT_RESULT_SQL = """
+        INSERT INTO job_results
+        (job_id, attempt, exit_code, stdout, stderr, stdout_size, stderr_size, truncated, created_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """
+
+    JOB_COLUMNS = (
+        "id", "command", "state", "attempts", "max_retries",
+        "created_at", "updated_at", "next_retry_at", "error_message", "timeout",
+        "fingerprint", "backoff_delay", "lease_expires_at",
+    )
+
     def __init__(self, db_path: str = ".queuectl.db"):
         self.db_path = db_path
         self._init_db()
@@ -13,6 +31,10 @@ class Storage:
         with self._get_connection() as conn:
             cursor = conn.cursor()
 
+            cursor.execute("PRAGMA user_version")
+            if cursor.fetchone()[0] >= self.SCHEMA_VERSION:
+                return
+
             cursor.execute("""
                 CREATE TABLE IF NOT EXISTS jobs (
                     id TEXT PRIMARY KEY,
@@ -23,10 +45,21 @@ class Storage:
                     created_at TEXT NOT NULL,
                     updated_at TEXT NOT NULL,
                     next_retry_at TEXT,
-                    error_message TEXT
+                    error_message TEXT,
+                    timeout INTEGER,
+                    fingerprint TEXT,
+                    backoff_delay REAL,
+                    lease_expires_at TEXT
                 )
             """)
 
+            self._add_missing_columns(cursor, "jobs", {
+                "timeout": "INTEGER",
+                "fingerprint": "TEXT",
+                "backoff_delay": "REAL",
+                "lease_expires_at": "TEXT",
+            })
+
             cursor.execute("""
                 CREATE TABLE IF NOT EXISTS config (
                     key TEXT PRIMARY KEY,
@@ -34,6 +67,21 @@ class Storage:
                 )
             """)
 
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS job_results (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    job_id TEXT NOT NULL,
+                    attempt INTEGER NOT NULL,
+                    exit_code INTEGER,
+                    stdout BLOB,
+                    stderr BLOB,
+                    stdout_size INTEGER NOT NULL DEFAULT 0,
+                    stderr_size INTEGER NOT NULL DEFAULT 0,
+                    truncated INTEGER NOT NULL DEFAULT 0,
+                    created_at TEXT NOT NULL
+                )
+            """)
+
             cursor.execute("""
                 CREATE INDEX IF NOT EXISTS idx_jobs_state ON jobs(state)
             """)
@@ -42,11 +90,40 @@ class Storage:
                 CREATE INDEX IF NOT EXISTS idx_jobs_next_retry ON jobs(next_retry_at)
             """)
 
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_jobs_state_next_retry ON jobs(state, next_retry_at)
+            """)
+
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_job_results_job ON job_results(job_id, id)
+            """)
+
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_jobs_state_fingerprint ON jobs(state, fingerprint, updated_at)
+            """)
+
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_jobs_state_updated ON jobs(state, updated_at)
+            """)
+
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_jobs_state_lease ON jobs(state, lease_expires_at)
+            """)
+
+            cursor.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
             conn.commit()
 
+    def _add_missing_columns(self, cursor, table: str, columns: Dict[str, str]):
+        cursor.execute(f"PRAGMA table_info({table})")
+        existing = {row["name"] for row in cursor.fetchall()}
+
+        for name, definition in columns.items():
+            if name not in existing:
+                cursor.execute(f"ALTER TABLE {table} ADD COLUMN {name} {definition}")
+
     @contextmanager
     def _get_connection(self):
-        conn = sqlite3.connect(self.db_path, timeout=30.0)
+        conn = sqlite3.connect(self.db_path, timeout=30.0, factory=self.connection_factory)
         conn.row_factory = sqlite3.Row
         try:
             yield conn
@@ -56,24 +133,24 @@ class Storage:
     def save_job(self, job: Job) -> bool:
         with self._get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("""
-                INSERT OR REPLACE INTO jobs
-                (id, command, state, attempts, max_retries, created_at, updated_at, next_retry_at, error_message)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                job.id,
-                job.command,
-                job.state,
-                job.attempts,
-                job.max_retries,
-                job.created_at,
-                job.updated_at,
-                job.next_retry_at,
-                job.error_message,
-            ))
+            cursor.execute(self._insert_job_sql(), self._job_row(job))
             conn.commit()
             return cursor.rowcount > 0
 
+    def save_jobs(self, jobs: List[Job]) -> int:
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.executemany(self._insert_job_sql(), [self._job_row(job) for job in jobs])
+            conn.commit()
+            return cursor.rowcount
+
+    def _insert_job_sql(self) -> str:
+        placeholders = ", ".join("?" for _ in self.JOB_COLUMNS)
+        return f"INSERT OR REPLACE INTO jobs ({', '.join(self.JOB_COLUMNS)}) VALUES ({placeholders})"
+
+    def _job_row(self, job: Job) -> tuple:
+        return tuple(getattr(job, column) for column in self.JOB_COLUMNS)
+
     def get_job(self, job_id: str) -> Optional[Job]:
         with self._get_connection() as conn:
             cursor = conn.cursor()
@@ -84,16 +161,19 @@ class Storage:
                 return Job.from_dict(dict(row))
             return None
 
-    def get_jobs_by_state(self, state: str) -> List[Job]:
+    def get_jobs_by_state(self, state: str, limit: Optional[int] = None) -> List[Job]:
         with self._get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("SELECT * FROM jobs WHERE state = ? ORDER BY created_at", (state,))
+            cursor.execute(
+                "SELECT * FROM jobs WHERE state = ? ORDER BY created_at LIMIT ?",
+                (state, limit if limit is not None else -1),
+            )
             return [Job.from_dict(dict(row)) for row in cursor.fetchall()]
 
-    def get_all_jobs(self) -> List[Job]:
+    def get_all_jobs(self, limit: Optional[int] = None) -> List[Job]:
         with self._get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("SELECT * FROM jobs ORDER BY created_at")
+            cursor.execute("SELECT * FROM jobs ORDER BY created_at LIMIT ?", (limit if limit is not None else -1,))
             return [Job.from_dict(dict(row)) for row in cursor.fetchall()]
 
     def get_retryable_jobs(self, current_time: str) -> List[Job]:
@@ -108,7 +188,47 @@ class Storage:
             """, (JobState.FAILED, current_time))
             return [Job.from_dict(dict(row)) for row in cursor.fetchall()]
 
+    def promote_retryable_jobs(self, current_time: str, batch_size: int = Config.DEFAULT_RETRY_BATCH_SIZE) -> int:
+        promoted = 0
+        updated_at = Job(id="", command="").updated_at
+
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+
+            cursor.execute("""
+                SELECT 1 FROM jobs
+                WHERE state = ?
+                AND next_retry_at IS NOT NULL
+                AND next_retry_at <= ?
+                LIMIT 1
+            """, (JobState.FAILED, current_time))
+            if cursor.fetchone() is None:
+                return 0
+
+            while True:
+                cursor.execute("""
+                    UPDATE jobs
+                    SET state = ?, next_retry_at = NULL, updated_at = ?
+                    WHERE id IN (
+                        SELECT id FROM jobs
+                        WHERE state = ?
+                        AND next_retry_at IS NOT NULL
+                        AND next_retry_at <= ?
+                        ORDER BY next_retry_at
+                        LIMIT ?
+                    )
+                """, (JobState.PENDING, updated_at, JobState.FAILED, current_time, batch_size))
+                conn.commit()
+
+                promoted += cursor.rowcount
+                if cursor.rowcount < batch_size:
+                    return promoted
+
     def get_pending_job(self) -> Optional[Job]:
+        jobs = self.claim_pending_jobs(1)
+        return jobs[0] if jobs else None
+
+    def claim_pending_jobs(self, limit: int, lease_expires_at: Optional[str] = None) -> List[Job]:
         with self._get_connection() as conn:
             cursor = conn.cursor()
 
@@ -118,27 +238,82 @@ class Storage:
                 SELECT * FROM jobs
                 WHERE state = ?
                 ORDER BY created_at
-                LIMIT 1
-            """, (JobState.PENDING,))
-
-            row = cursor.fetchone()
-            if row:
-                job = Job.from_dict(dict(row))
+                LIMIT ?
+            """, (JobState.PENDING, limit))
 
-                job.state = JobState.PROCESSING
-                job.update_timestamp()
+            jobs = [Job.from_dict(dict(row)) for row in cursor.fetchall()]
+            if jobs:
+                updated_at = Job(id="", command="").updated_at
+                for job in jobs:
+                    job.state = JobState.PROCESSING
+                    job.updated_at = updated_at
+                    job.lease_expires_at = lease_expires_at
 
-                cursor.execute("""
+                cursor.executemany("""
                     UPDATE jobs
-                    SET state = ?, updated_at = ?
+                    SET state = ?, updated_at = ?, lease_expires_at = ?
                     WHERE id = ?
-                """, (job.state, job.updated_at, job.id))
+                """, [(job.state, job.updated_at, job.lease_expires_at, job.id) for job in jobs])
 
-                conn.commit()
-                return job
-            else:
-                conn.commit()
-                return None
+            conn.commit()
+            return jobs
+
+    def extend_leases(self, job_ids: List[str], lease_expires_at: str, current_time: str) -> List[str]:
+        if not job_ids:
+            return []
+
+        placeholders = ", ".join("?" for _ in job_ids)
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("BEGIN IMMEDIATE")
+
+            cursor.execute(f"""
+                SELECT id FROM jobs
+                WHERE state = ? AND lease_expires_at > ? AND id IN ({placeholders})
+            """, [JobState.PROCESSING, current_time] + list(job_ids))
+            held = [row["id"] for row in cursor.fetchall()]
+
+            if held:
+                placeholders = ", ".join("?" for _ in held)
+                cursor.execute(
+                    f"UPDATE jobs SET lease_expires_at = ? WHERE id IN ({placeholders})",
+                    [lease_expires_at] + held,
+                )
+
+            conn.commit()
+            return held
+
+    def get_leased_jobs(self, job_ids: List[str]) -> List[Job]:
+        if not job_ids:
+            return []
+
+        placeholders = ", ".join("?" for _ in job_ids)
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"""
+                SELECT * FROM jobs
+                WHERE state = ? AND lease_expires_at IS NOT NULL AND id IN ({placeholders})
+            """, [JobState.PROCESSING] + list(job_ids))
+            return [Job.from_dict(dict(row)) for row in cursor.fetchall()]
+
+    def get_expired_leases(self, current_time: str) -> List[Job]:
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT * FROM jobs
+                WHERE state = ? AND lease_expires_at IS NOT NULL AND lease_expires_at <= ?
+                ORDER BY lease_expires_at
+            """, (JobState.PROCESSING, current_time))
+            return [Job.from_dict(dict(row)) for row in cursor.fetchall()]
+
+    def count_leased_jobs(self) -> int:
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT COUNT(*) FROM jobs
+                WHERE state = ? AND lease_expires_at IS NOT NULL
+            """, (JobState.PROCESSING,))
+            return cursor.fetchone()[0]
 
     def update_job_state(self, job_id: str, state: str, error_message: Optional[str] = None) -> bool:
         with self._get_connection() as conn:
@@ -162,13 +337,253 @@ class Storage:
             conn.commit()
             return cursor.rowcount > 0
 
+    def apply_job_updates(
+        self,
+        updates: List[Tuple[str, Dict[str, Any]]],
+        results: List[Tuple[JobResult, int]] = (),
+    ) -> int:
+        grouped = {}
+        for job_id, fields in updates:
+            columns = tuple(fields)
+            unknown = set(columns) - set(self.JOB_COLUMNS)
+            if unknown:
+                raise ValueError(f"Unknown job columns: {', '.join(sorted(unknown))}")
+            grouped.setdefault(columns, []).append(tuple(fields[column] for column in columns) + (job_id,))
+
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+
+            for columns, rows in grouped.items():
+                assignments = ", ".join(f"{column} = ?" for column in columns)
+                cursor.executemany(f"UPDATE jobs SET {assignments} WHERE id = ?", rows)
+
+            if results:
+                cursor.executemany(
+                    self.INSERT_RESULT_SQL,
+                    [self._result_row(result, max_bytes) for result, max_bytes in results],
+                )
+
+            conn.commit()
+            return len(updates)
+
+    def _result_row(self, result: JobResult, max_bytes: int) -> tuple:
+        stdout, stdout_size, stdout_truncated = self._compress_output(result.stdout, max_bytes, result.stdout_size)
+        stderr, stderr_size, stderr_truncated = self._compress_output(result.stderr, max_bytes, result.stderr_size)
+
+        return (
+            result.job_id,
+            result.attempt,
+            result.exit_code,
+            stdout,
+            stderr,
+            stdout_size,
+            stderr_size,
+            int(stdout_truncated or stderr_truncated),
+            result.created_at,
+        )
+
+    def get_job_result(self, job_id: str, attempt: Optional[int] = None) -> Optional[JobResult]:
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+
+            if attempt is None:
+                cursor.execute("""
+                    SELECT * FROM job_results
+                    WHERE job_id = ?
+                    ORDER BY id DESC
+                    LIMIT 1
+                """, (job_id,))
+            else:
+                cursor.execute("""
+                    SELECT * FROM job_results
+                    WHERE job_id = ? AND attempt = ?
+                    ORDER BY id DESC
+                    LIMIT 1
+                """, (job_id, attempt))
+
+            row = cursor.fetchone()
+            if not row:
+                return None
+
+            return JobResult(
+                job_id=row["job_id"],
+                attempt=row["attempt"],
+                exit_code=row["exit_code"],
+                stdout=self._decompress_output(row["stdout"]),
+                stderr=self._decompress_output(row["stderr"]),
+                stdout_size=row["stdout_size"],
+                stderr_size=row["stderr_size"],
+                truncated=bool(row["truncated"]),
+                created_at=row["created_at"],
+            )
+
+    def _compress_output(self, output: str, max_bytes: int, original_size: int = 0):
+        data = (output or "").encode("utf-8", errors="replace")
+        size = max(len(data), original_size or 0)
+
+        if max_bytes > 0 and len(data) > max_bytes:
+            data = data[-max_bytes:]
+
+        return zlib.compress(data), size, size > len(data)
+
+    def _decompress_output(self, blob: Optional[bytes]) -> str:
+        if not blob:
+            return ""
+        return zlib.decompress(blob).decode("utf-8", errors="replace")
+
     def delete_job(self, job_id: str) -> bool:
         with self._get_connection() as conn:
             cursor = conn.cursor()
+            cursor.execute("DELETE FROM job_results WHERE job_id = ?", (job_id,))
             cursor.execute("DELETE FROM jobs WHERE id = ?", (job_id,))
             conn.commit()
             return cursor.rowcount > 0
 
+    def backfill_fingerprints(self, fingerprint_fn, batch_size: int = Config.DEFAULT_DLQ_BATCH_SIZE) -> int:
+        filled = 0
+
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+
+            while True:
+                cursor.execute("""
+                    SELECT id, command, error_message FROM jobs
+                    WHERE state = ? AND fingerprint IS NULL
+                    LIMIT ?
+                """, (JobState.DEAD, batch_size))
+                rows = cursor.fetchall()
+                if not rows:
+                    return filled
+
+                cursor.executemany(
+                    "UPDATE jobs SET fingerprint = ? WHERE id = ?",
+                    [(fingerprint_fn(row["command"], row["error_message"]), row["id"]) for row in rows],
+                )
+                conn.commit()
+                filled += len(rows)
+
+    def get_dlq_groups(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT fingerprint, COUNT(*) AS count, MIN(updated_at) AS first_seen, MAX(updated_at) AS last_seen
+                FROM jobs
+                WHERE state = ?
+                GROUP BY fingerprint
+                ORDER BY count DESC
+                LIMIT ?
+            """, (JobState.DEAD, limit if limit is not None else -1))
+            groups = [dict(row) for row in cursor.fetchall()]
+
+            for group in groups:
+                cursor.execute("""
+                    SELECT command, error_message FROM jobs
+                    WHERE state = ? AND fingerprint IS ?
+                    LIMIT 1
+                """, (JobState.DEAD, group["fingerprint"]))
+                sample = cursor.fetchone()
+                group["command"] = sample["command"] if sample else None
+                group["error_message"] = sample["error_message"] if sample else None
+
+            return groups
+
+    def retry_dead_jobs(
+        self,
+        fingerprint: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        pattern: Optional[str] = None,
+        batch_size: int = Config.DEFAULT_DLQ_BATCH_SIZE,
+        rate: Optional[float] = None,
+    ) -> int:
+        if rate is not None and not rate > 0:
+            raise ValueError("rate must be greater than 0")
+
+        where, params = self._dlq_filter(fingerprint, since, until, pattern)
+        retried = 0
+        start = datetime.now(timezone.utc)
+
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+
+            while True:
+                job_ids = self._select_ids(cursor, where, params, batch_size)
+                if not job_ids:
+                    return retried
+
+                updated_at = Job(id="", command="").updated_at
+                if rate:
+                    rows = []
+                    for offset, job_id in enumerate(job_ids, retried):
+                        release_at = start + timedelta(seconds=offset / rate)
+                        next_retry_at = release_at.isoformat(timespec="microseconds").replace('+00:00', 'Z')
+                        rows.append((JobState.FAILED, next_retry_at, updated_at, job_id))
+                else:
+                    rows = [(JobState.PENDING, None, updated_at, job_id) for job_id in job_ids]
+
+                cursor.executemany("""
+                    UPDATE jobs
+                    SET state = ?, attempts = 0, error_message = NULL, fingerprint = NULL,
+                        backoff_delay = NULL, next_retry_at = ?, updated_at = ?
+                    WHERE id = ?
+                """, rows)
+                conn.commit()
+                retried += len(job_ids)
+
+    def purge_dead_jobs(
+        self,
+        fingerprint: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        pattern: Optional[str] = None,
+        batch_size: int = Config.DEFAULT_DLQ_BATCH_SIZE,
+    ) -> int:
+        where, params = self._dlq_filter(fingerprint, since, until, pattern)
+        purged = 0
+
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+
+            while True:
+                job_ids = self._select_ids(cursor, where, params, batch_size)
+                if not job_ids:
+                    return purged
+
+                placeholders = ", ".join("?" for _ in job_ids)
+                cursor.execute(f"DELETE FROM job_results WHERE job_id IN ({placeholders})", job_ids)
+                cursor.execute(f"DELETE FROM jobs WHERE id IN ({placeholders})", job_ids)
+                conn.commit()
+                purged += len(job_ids)
+
+    def _dlq_filter(
+        self,
+        fingerprint: Optional[str],
+        since: Optional[str],
+        until: Optional[str],
+        pattern: Optional[str],
+    ) -> Tuple[str, List[Any]]:
+        clauses = ["state = ?"]
+        params: List[Any] = [JobState.DEAD]
+
+        if fingerprint:
+            clauses.append("fingerprint = ?")
+            params.append(fingerprint)
+        if since:
+            clauses.append("updated_at >= ?")
+            params.append(since)
+        if until:
+            clauses.append("updated_at < ?")
+            params.append(until)
+        if pattern:
+            clauses.append("(command LIKE ? OR error_message LIKE ?)")
+            params.extend([pattern, pattern])
+
+        return " AND ".join(clauses), params
+
+    def _select_ids(self, cursor, where: str, params: List[Any], limit: int) -> List[str]:
+        cursor.execute(f"SELECT id FROM jobs WHERE {where} LIMIT ?", params + [limit])
+        return [row["id"] for row in cursor.fetchall()]
+
     def get_job_counts(self) -> Dict[str, int]:
         with self._get_connection() as conn:
             cursor = conn.cursor()
@@ -194,13 +609,54 @@ class Storage:
                 return json.loads(row["value"])
             return default
 
+    def get_all_config(self) -> Dict[str, Any]:
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT key, value FROM config")
+            return {row["key"]: json.loads(row["value"]) for row in cursor.fetchall()}
+
     def load_config(self) -> Config:
+        values = self.get_all_config()
         return Config(
-            max_retries=self.get_config("max_retries", Config.DEFAULT_MAX_RETRIES),
-            backoff_base=self.get_config("backoff_base", Config.DEFAULT_BACKOFF_BASE),
+            max_retries=values.get("max_retries", Config.DEFAULT_MAX_RETRIES),
+            backoff_base=values.get("backoff_base", Config.DEFAULT_BACKOFF_BASE),
             db_path=self.db_path,
+            backoff_jitter=values.get("backoff_jitter", Config.DEFAULT_BACKOFF_JITTER),
+            backoff_max_delay=values.get("backoff_max_delay", Config.DEFAULT_BACKOFF_MAX_DELAY),
+            retry_batch_size=values.get("retry_batch_size", Config.DEFAULT_RETRY_BATCH_SIZE),
+            result_max_bytes=values.get("result_max_bytes", Config.DEFAULT_RESULT_MAX_BYTES),
+            job_timeout=values.get("job_timeout", Config.DEFAULT_JOB_TIMEOUT),
+            kill_grace=values.get("kill_grace", Config.DEFAULT_KILL_GRACE),
+            limit_cpu_seconds=values.get("limit_cpu_seconds", 0),
+            limit_memory_mb=values.get("limit_memory_mb", 0),
+            limit_open_files=values.get("limit_open_files", 0),
+            profile_enabled=values.get("profile_enabled", False),
+            profile_slow_query_ms=values.get("profile_slow_query_ms", Config.DEFAULT_PROFILE_SLOW_QUERY_MS),
+            profile_interval=values.get("profile_interval", 0),
+            profile_sample_every=values.get("profile_sample_every", Config.DEFAULT_PROFILE_SAMPLE_EVERY),
+            commit_interval_ms=values.get("commit_interval_ms", Config.DEFAULT_COMMIT_INTERVAL_MS),
+            commit_batch_size=values.get("commit_batch_size", Config.DEFAULT_COMMIT_BATCH_SIZE),
+            dlq_batch_size=values.get("dlq_batch_size", Config.DEFAULT_DLQ_BATCH_SIZE),
+            broker_token=values.get("broker_token", ""),
         )
 
     def save_full_config(self, config: Config):
         self.save_config("max_retries", config.max_retries)
         self.save_config("backoff_base", config.backoff_base)
+        self.save_config("backoff_jitter", config.backoff_jitter)
+        self.save_config("backoff_max_delay", config.backoff_max_delay)
+        self.save_config("retry_batch_size", config.retry_batch_size)
+        self.save_config("result_max_bytes", config.result_max_bytes)
+        self.save_config("job_timeout", config.job_timeout)
+        self.save_config("kill_grace", config.kill_grace)
+        self.save_config("limit_cpu_seconds", config.limit_cpu_seconds)
+        self.save_config("limit_memory_mb", config.limit_memory_mb)
+        self.save_config("limit_open_files", config.limit_open_files)
+        self.save_config("profile_enabled", config.profile_enabled)
+        self.save_config("profile_slow_query_ms", config.profile_slow_query_ms)
+        self.save_config("profile_interval", config.profile_interval)
+        self.save_config("profile_sample_every", config.profile_sample_every)
+        self.save_config("commit_interval_ms", config.commit_interval_ms)
+        self.save_config("commit_batch_size", config.commit_batch_size)
+        self.save_config("dlq_batch_size", config.dlq_batch_size)
+        self.save_config("broker_token", config.broker_token)
@@ -3,18 +3,47 @@ import signal
 import os
 import json
 from multiprocessing import Process
-from typing import List
+from typing import List, Optional
 from .storage import Storage
 from .queue import QueueManager
 from .models import Config
+from .executor import JobExecutor
+from .writebehind import WriteBehindBuffer
+from .protocol import MAX_FRAME_SIZE
+
+REMOTE_OUTPUT_MAX_BYTES = MAX_FRAME_SIZE // 16
+
+def _tail_bytes(text: str, max_bytes: int) -> str:
+    if max_bytes <= 0:
+        return ""
+    data = (text or "").encode("utf-8", errors="replace")
+    if len(data) <= max_bytes:
+        return text or ""
+    return data[-max_bytes:].decode("utf-8", errors="ignore")
+
+class NullProfiler:
+    def begin(self):
+        pass
+
+    def mark(self, phase: str):
+        pass
+
+    def end(self):
+        pass
+
+    def close(self):
+        pass
 
 class WorkerManager:
     WORKER_PID_FILE = ".queuectl_workers.json"
+    REMOTE_ACK_RETRIES = 5
 
-    def __init__(self, config: Config):
+    def __init__(self, config: Config, broker_address: Optional[str] = None, broker_token: Optional[str] = None):
         self.config = config
+        self.broker_address = broker_address
+        self.broker_token = broker_token
 
-    def start_workers(self, count: int = 1):
+    def start_workers(self, count: int = 1) -> bool:
         existing_pids = self._load_worker_pids()
 
         if existing_pids:
@@ -23,17 +52,19 @@ class WorkerManager:
                 print(f"Warning: {running_count} worker(s) already running")
                 print(f"PIDs: {existing_pids}")
                 print("Stop existing workers first")
-                return
+                return False
 
         worker_pids = []
         for i in range(count):
-            process = Process(target=self._worker_loop, args=(i + 1,))
+            target = self._remote_worker_loop if self.broker_address else self._worker_loop
+            process = Process(target=target, args=(i + 1,))
             process.start()
             worker_pids.append(process.pid)
             print(f"Started worker {i + 1} (PID: {process.pid})")
 
         self._save_worker_pids(worker_pids)
         print(f"\nStarted {count} worker(s) successfully")
+        return True
 
     def stop_workers(self):
         worker_pids = self._load_worker_pids()
@@ -61,7 +92,7 @@ class WorkerManager:
 
         if stopped_count > 0:
             print(f"\nSent stop signal to {stopped_count} worker(s)")
-            print("Workers will finish their current jobs before stopping")
+            print("Running jobs will be terminated and re-queued")
 
     def get_worker_status(self) -> dict:
         worker_pids = self._load_worker_pids()
@@ -79,41 +110,172 @@ class WorkerManager:
     def _worker_loop(self, worker_id: int):
         shutdown_flag = {"should_stop": False}
 
+        storage = Storage(self.config.db_path)
+        write_buffer = None
+        if self.config.commit_interval_ms > 0:
+            write_buffer = WriteBehindBuffer(storage, self.config.commit_interval_ms, self.config.commit_batch_size)
+        queue_manager = QueueManager(storage, self.config, write_buffer)
+        profiler = NullProfiler()
+        if self.config.profile_enabled:
+            from .profiling import create_worker_profiler
+            profiler = create_worker_profiler(worker_id, self.config, storage, write_buffer)
+
         def signal_handler(signum, frame):
             print(f"\nWorker {worker_id} (PID {os.getpid()}): Received shutdown signal")
             shutdown_flag["should_stop"] = True
+            queue_manager.executor.request_stop()
 
         signal.signal(signal.SIGTERM, signal_handler)
         signal.signal(signal.SIGINT, signal_handler)
 
-        storage = Storage(self.config.db_path)
-        queue_manager = QueueManager(storage, self.config)
-
         print(f"Worker {worker_id} (PID {os.getpid()}): Started")
 
         try:
             while not shutdown_flag["should_stop"]:
+                profiler.begin()
                 job = queue_manager.get_next_job()
+                profiler.mark("claim")
 
                 if job:
                     print(f"Worker {worker_id} (PID {os.getpid()}): Processing job {job.id}")
-                    success = queue_manager.process_job(job)
+                    result = queue_manager.execute_job(job)
+                    profiler.mark("exec")
+                    success = queue_manager.record_result(job, result)
+                    profiler.mark("persist")
+                    profiler.end()
 
                     if success:
                         print(f"Worker {worker_id} (PID {os.getpid()}): Job {job.id} completed")
+                    elif job.state == "pending":
+                        print(f"Worker {worker_id} (PID {os.getpid()}): Job {job.id} interrupted and re-queued")
                     else:
                         if job.state == "dead":
                             print(f"Worker {worker_id} (PID {os.getpid()}): Job {job.id} failed permanently")
                         else:
                             print(f"Worker {worker_id} (PID {os.getpid()}): Job {job.id} failed (attempt {job.attempts}/{job.max_retries})")
                 else:
+                    profiler.end()
                     time.sleep(1)
 
         except KeyboardInterrupt:
             print(f"\nWorker {worker_id} (PID {os.getpid()}): Interrupted")
         finally:
+            if write_buffer:
+                write_buffer.close()
+            profiler.close()
             print(f"Worker {worker_id} (PID {os.getpid()}): Stopped")
 
+    def _remote_worker_loop(self, worker_id: int):
+        from .broker import BrokerClient, BrokerError, LeaseHeartbeat, DEFAULT_LEASE_SECONDS, parse_address
+        from .protocol import ProtocolError
+
+        shutdown_flag = {"should_stop": False}
+
+        host, port = parse_address(self.broker_address)
+        client = BrokerClient(host, port, self.broker_token)
+        heartbeat = LeaseHeartbeat(client, DEFAULT_LEASE_SECONDS)
+        executor = None
+
+        def signal_handler(signum, frame):
+            print(f"\nWorker {worker_id} (PID {os.getpid()}): Received shutdown signal")
+            shutdown_flag["should_stop"] = True
+            if executor:
+                executor.request_stop()
+
+        signal.signal(signal.SIGTERM, signal_handler)
+        signal.signal(signal.SIGINT, signal_handler)
+
+        print(f"Worker {worker_id} (PID {os.getpid()}): Started against broker {host}:{port}")
+
+        try:
+            settings = None
+            while settings is None and not shutdown_flag["should_stop"]:
+                try:
+                    settings = client.hello()
+                except (OSError, ProtocolError, BrokerError) as e:
+                    print(f"Worker {worker_id} (PID {os.getpid()}): Broker unavailable: {e}")
+                    time.sleep(1)
+
+            max_bytes = min(
+                (settings or {}).get("result_max_bytes", self.config.result_max_bytes),
+                REMOTE_OUTPUT_MAX_BYTES,
+            )
+            if settings is not None:
+                executor = JobExecutor(
+                    timeout=settings.get("job_timeout", self.config.job_timeout),
+                    kill_grace=settings.get("kill_grace", self.config.kill_grace),
+                    cpu_seconds=settings.get("limit_cpu_seconds", 0),
+                    memory_mb=settings.get("limit_memory_mb", 0),
+                    open_files=settings.get("limit_open_files", 0),
+                    output_max_bytes=max_bytes,
+                )
+
+            while not shutdown_flag["should_stop"]:
+                try:
+                    jobs = client.claim(1, DEFAULT_LEASE_SECONDS)
+                except (OSError, ProtocolError, BrokerError) as e:
+                    print(f"Worker {worker_id} (PID {os.getpid()}): Broker unavailable: {e}")
+                    time.sleep(1)
+                    continue
+
+                if not jobs:
+                    time.sleep(1)
+                    continue
+
+                job = jobs[0]
+                if shutdown_flag["should_stop"]:
+                    self._ack_results(client, worker_id, [{
+                        "id": job.id, "success": False, "interrupted": True,
+                        "message": "Worker shut down before the job started",
+                    }])
+                    break
+
+                heartbeat.track([job.id])
+                print(f"Worker {worker_id} (PID {os.getpid()}): Processing job {job.id}")
+                result = executor.run(job.command, job.timeout)
+                self._ack_results(client, worker_id, [{
+                    "id": job.id,
+                    "success": result.success,
+                    "message": result.message[-QueueManager.ERROR_MESSAGE_MAX_LENGTH:],
+                    "exit_code": result.exit_code,
+                    "stdout": _tail_bytes(result.stdout, max_bytes),
+                    "stderr": _tail_bytes(result.stderr, max_bytes),
+                    "stdout_size": result.stdout_size,
+                    "stderr_size": result.stderr_size,
+                    "interrupted": result.interrupted,
+                }])
+                heartbeat.untrack([job.id])
+
+                if result.success:
+                    print(f"Worker {worker_id} (PID {os.getpid()}): Job {job.id} completed")
+                elif result.interrupted:
+                    print(f"Worker {worker_id} (PID {os.getpid()}): Job {job.id} interrupted and re-queued")
+                else:
+                    print(f"Worker {worker_id} (PID {os.getpid()}): Job {job.id} failed")
+
+        except KeyboardInterrupt:
+            print(f"\nWorker {worker_id} (PID {os.getpid()}): Interrupted")
+        finally:
+            heartbeat.stop()
+            client.close()
+            print(f"Worker {worker_id} (PID {os.getpid()}): Stopped")
+
+    def _ack_results(self, client, worker_id: int, results: List[dict]):
+        from .broker import BrokerError
+        from .protocol import ProtocolError
+
+        for attempt in range(self.REMOTE_ACK_RETRIES):
+            try:
+                rejected = client.ack(results)
+                if rejected:
+                    print(f"Worker {worker_id} (PID {os.getpid()}): Broker rejected results for expired lease(s): {', '.join(rejected)}")
+                return
+            except (OSError, ProtocolError, BrokerError) as e:
+                print(f"Worker {worker_id} (PID {os.getpid()}): Ack failed ({e}), retrying")
+                time.sleep(min(2 ** attempt, 10))
+
+        print(f"Worker {worker_id} (PID {os.getpid()}): Giving up on ack; leases will expire on the broker")
+
     def _save_worker_pids(self, pids: List[int]):
         with open(self.WORKER_PID_FILE, "w") as f:
             json.dump(pids, f)
@@ -0,0 +1,69 @@
+import threading
+import time
+from typing import Any, Dict, List, Tuple
+from .models import Config, JobResult
+
+class WriteBehindBuffer:
+    def __init__(
+        self,
+        storage,
+        max_delay_ms: int = Config.DEFAULT_COMMIT_INTERVAL_MS,
+        max_updates: int = Config.DEFAULT_COMMIT_BATCH_SIZE,
+    ):
+        self.storage = storage
+        self.max_delay = max_delay_ms / 1000.0
+        self.max_updates = max(max_updates, 1)
+        self.commits = 0
+        self.background_seconds = 0.0
+
+        self._updates: List[Tuple[str, Dict[str, Any]]] = []
+        self._results: List[Tuple[JobResult, int]] = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="queuectl-write-behind", daemon=True)
+        self._thread.start()
+
+    def add(self, job_id: str, fields: Dict[str, Any], results: List[Tuple[JobResult, int]] = ()):
+        with self._lock:
+            self._updates.append((job_id, fields))
+            self._results.extend(results)
+            full = len(self._updates) >= self.max_updates
+
+        if full:
+            self.flush()
+
+    def flush(self) -> int:
+        with self._flush_lock:
+            with self._lock:
+                updates, self._updates = self._updates, []
+                results, self._results = self._results, []
+
+            if not updates and not results:
+                return 0
+
+            try:
+                self.storage.apply_job_updates(updates, results)
+            except Exception:
+                with self._lock:
+                    self._updates[:0] = updates
+                    self._results[:0] = results
+                raise
+
+            self.commits += 1
+            return len(updates)
+
+    def close(self):
+        self._stop.set()
+        self._thread.join()
+        self.flush()
+
+    def _run(self):
+        while not self._stop.wait(self.max_delay):
+            start = time.perf_counter()
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"Write-behind flush failed, will retry: {e}")
+            finally:
+                self.background_seconds += time.perf_counter() - start
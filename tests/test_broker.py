@@ -0,0 +1,176 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+
+from queuectl.broker import BrokerClient, BrokerError, JobBroker
+from queuectl.models import Config, JobState
+from queuectl.queue import QueueManager
+from queuectl.storage import Storage
+from queuectl.writebehind import WriteBehindBuffer
+
+class BrokerTestCase(unittest.TestCase):
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tempdir.name, "queue.db")
+        self.storage = Storage(self.db_path)
+        self.brokers = []
+        self.clients = []
+
+    def tearDown(self):
+        for client in self.clients:
+            client.close()
+        for broker, thread in self.brokers:
+            broker.close()
+            thread.join(5)
+        self.tempdir.cleanup()
+
+    def start_broker(self, lease_seconds=60, token=None, write_buffer=None):
+        queue_manager = QueueManager(self.storage, self.storage.load_config(), write_buffer)
+        broker = JobBroker(queue_manager, port=0, lease_seconds=lease_seconds, token=token)
+        thread = threading.Thread(target=broker.run, daemon=True)
+        thread.start()
+        self.assertTrue(broker.started.wait(5))
+        self.brokers.append((broker, thread))
+        return broker, thread
+
+    def connect(self, broker, token=None):
+        client = BrokerClient("127.0.0.1", broker.port, token, timeout=5)
+        self.clients.append(client)
+        return client
+
+    def wait_for_state(self, job_id, state, timeout=5.0):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            job = self.storage.get_job(job_id)
+            if job.state == state:
+                return job
+            time.sleep(0.05)
+        self.fail(f"job {job_id} did not reach {state}")
+
+    def test_enqueue_claim_ack(self):
+        broker, _ = self.start_broker()
+        client = self.connect(broker)
+
+        job_ids = client.enqueue([{"command": "echo one"}, {"command": "echo two", "timeout": 7}])
+        self.assertEqual(len(job_ids), 2)
+
+        jobs = client.claim(10, 30)
+        self.assertEqual(sorted(job.id for job in jobs), sorted(job_ids))
+        self.assertEqual({job.state for job in jobs}, {JobState.PROCESSING})
+        self.assertEqual(client.status()["leases"], 2)
+
+        rejected = client.ack([
+            {"id": job_ids[0], "success": True, "message": "one", "exit_code": 0, "stdout": "one\n"},
+            {"id": job_ids[1], "success": False, "message": "boom", "exit_code": 1},
+            {"id": "job-unknown", "success": True},
+        ])
+        self.assertEqual(rejected, ["job-unknown"])
+
+        self.assertEqual(self.storage.get_job(job_ids[0]).state, JobState.COMPLETED)
+        self.assertEqual(self.storage.get_job_result(job_ids[0]).stdout, "one\n")
+        failed = self.storage.get_job(job_ids[1])
+        self.assertEqual((failed.state, failed.attempts, failed.lease_expires_at), (JobState.FAILED, 1, None))
+        self.assertEqual(client.status()["leases"], 0)
+
+    def test_hello_returns_worker_settings(self):
+        self.storage.save_full_config(Config(kill_grace=2, limit_open_files=64, result_max_bytes=1024))
+        broker, _ = self.start_broker()
+
+        settings = self.connect(broker).hello()
+        self.assertEqual(settings["kill_grace"], 2)
+        self.assertEqual(settings["limit_open_files"], 64)
+        self.assertEqual(settings["result_max_bytes"], 1024)
+
+    def test_heartbeat_keeps_lease_and_expiry_fails_job(self):
+        broker, _ = self.start_broker(lease_seconds=1)
+        client = self.connect(broker)
+        job_id = client.enqueue([{"command": "sleep 10", "max_retries": 3}])[0]
+        client.claim(1)
+
+        for _ in range(4):
+            time.sleep(0.4)
+            self.assertEqual(client.heartbeat([job_id], 1), [])
+        self.assertEqual(self.storage.get_job(job_id).state, JobState.PROCESSING)
+
+        job = self.wait_for_state(job_id, JobState.FAILED)
+        self.assertEqual(job.attempts, 1)
+        self.assertIn("Lease expired", job.error_message)
+        self.assertEqual(client.heartbeat([job_id], 1), [job_id])
+        self.assertEqual(client.ack([{"id": job_id, "success": True}]), [job_id])
+
+    def test_duplicate_ack_is_rejected_while_buffered(self):
+        write_buffer = WriteBehindBuffer(self.storage, max_delay_ms=10000, max_updates=1000)
+        self.addCleanup(write_buffer.close)
+        broker, _ = self.start_broker(write_buffer=write_buffer)
+        client = self.connect(broker)
+        job_id = client.enqueue([{"command": "echo"}])[0]
+        client.claim(1)
+
+        self.assertEqual(client.ack([{"id": job_id, "success": False, "message": "boom"}]), [])
+        self.assertEqual(client.ack([{"id": job_id, "success": False, "message": "boom"}]), [job_id])
+
+        write_buffer.flush()
+        self.assertEqual(self.storage.get_job(job_id).attempts, 1)
+
+    def test_leases_survive_broker_restart(self):
+        broker, thread = self.start_broker()
+        client = self.connect(broker)
+        job_id = client.enqueue([{"command": "echo"}])[0]
+        client.claim(1)
+
+        broker.close()
+        thread.join(5)
+        self.assertFalse(thread.is_alive())
+        self.assertEqual(self.storage.get_job(job_id).state, JobState.PROCESSING)
+
+        broker, _ = self.start_broker()
+        client = self.connect(broker)
+        self.assertEqual(client.ack([{"id": job_id, "success": True}]), [])
+        self.assertEqual(self.storage.get_job(job_id).state, JobState.COMPLETED)
+
+    def test_startup_recovers_expired_leases(self):
+        broker, thread = self.start_broker(lease_seconds=1)
+        client = self.connect(broker)
+        job_id = client.enqueue([{"command": "echo"}])[0]
+        client.claim(1)
+        client.close()
+        broker.close()
+        thread.join(5)
+
+        time.sleep(1.2)
+        self.start_broker(lease_seconds=60)
+        self.assertIn("Lease expired", self.wait_for_state(job_id, JobState.FAILED).error_message)
+
+    def test_shutdown_with_connected_clients(self):
+        broker, thread = self.start_broker()
+        client = self.connect(broker)
+        client.status()
+
+        started = time.monotonic()
+        broker.close()
+        thread.join(5)
+        self.assertFalse(thread.is_alive())
+        self.assertLess(time.monotonic() - started, 5)
+
+        with self.assertRaises(OSError):
+            client.status()
+
+    def test_token_is_required(self):
+        broker, _ = self.start_broker(token="secret")
+
+        with self.assertRaises(BrokerError):
+            self.connect(broker).status()
+        with self.assertRaises(BrokerError):
+            self.connect(broker, "wrong").status()
+        self.assertEqual(self.connect(broker, "secret").status()["leases"], 0)
+
+    def test_non_loopback_bind_requires_token(self):
+        queue_manager = QueueManager(self.storage, Config(db_path=self.db_path))
+        with self.assertRaises(ValueError):
+            JobBroker(queue_manager, host="0.0.0.0", port=0)
+        JobBroker(queue_manager, host="0.0.0.0", port=0, token="secret")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,145 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta, timezone
+
+from queuectl.models import Config, Job, JobResult, JobState
+from queuectl.queue import QueueManager
+from queuectl.storage import Storage
+
+def parse_time(value):
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+class DeadLetterQueueTestCase(unittest.TestCase):
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tempdir.name, "queue.db")
+        self.storage = Storage(self.db_path)
+        self.queue_manager = QueueManager(self.storage, Config(db_path=self.db_path, dlq_batch_size=3))
+
+    def tearDown(self):
+        self.tempdir.cleanup()
+
+    def add_dead_jobs(self, count, command, error_message, died_at="2026-01-01T00:00:00Z", prefix=None):
+        prefix = prefix or command.split()[0]
+        jobs = [
+            Job(
+                id=f"{prefix}-{i}",
+                command=f"{command} {i}",
+                state=JobState.DEAD,
+                attempts=3,
+                error_message=f"{error_message} {i}",
+                updated_at=died_at,
+                backoff_delay=8.0,
+            )
+            for i in range(count)
+        ]
+        self.storage.save_jobs(jobs)
+        return [job.id for job in jobs]
+
+    def states(self, job_ids):
+        return {self.storage.get_job(job_id).state for job_id in job_ids}
+
+    def test_retry_by_group(self):
+        fetch_ids = self.add_dead_jobs(4, "fetch http://a", "connection refused")
+        parse_ids = self.add_dead_jobs(2, "parse file", "bad header")
+
+        groups = {group["count"]: group["fingerprint"] for group in self.queue_manager.get_dlq_groups()}
+        self.assertEqual(sorted(groups), [2, 4])
+
+        self.assertEqual(self.queue_manager.retry_dlq_jobs(fingerprint=groups[4]), 4)
+        self.assertEqual(self.states(fetch_ids), {JobState.PENDING})
+        self.assertEqual(self.states(parse_ids), {JobState.DEAD})
+
+        job = self.storage.get_job(fetch_ids[0])
+        self.assertEqual((job.attempts, job.error_message, job.fingerprint, job.backoff_delay), (0, None, None, None))
+
+    def test_retry_by_time_range(self):
+        early = self.add_dead_jobs(2, "early", "boom", "2026-01-01T00:00:00Z")
+        middle = self.add_dead_jobs(2, "middle", "boom", "2026-01-02T00:00:00Z")
+        late = self.add_dead_jobs(2, "late", "boom", "2026-01-03T00:00:00Z")
+
+        retried = self.queue_manager.retry_dlq_jobs(since="2026-01-02T00:00:00Z", until="2026-01-03T00:00:00Z")
+
+        self.assertEqual(retried, 2)
+        self.assertEqual(self.states(middle), {JobState.PENDING})
+        self.assertEqual(self.states(early + late), {JobState.DEAD})
+
+    def test_retry_by_pattern_matches_command_or_error(self):
+        by_command = self.add_dead_jobs(2, "backup db", "disk full")
+        by_error = self.add_dead_jobs(2, "sync", "backup target missing")
+        other = self.add_dead_jobs(2, "report", "timeout")
+
+        self.assertEqual(self.queue_manager.retry_dlq_jobs(pattern="%backup%"), 4)
+        self.assertEqual(self.states(by_command + by_error), {JobState.PENDING})
+        self.assertEqual(self.states(other), {JobState.DEAD})
+
+    def test_retry_spans_several_batches(self):
+        job_ids = self.add_dead_jobs(10, "job", "boom")
+
+        self.assertEqual(self.queue_manager.retry_dlq_jobs(pattern="%"), 10)
+        self.assertEqual(self.states(job_ids), {JobState.PENDING})
+        self.assertEqual(self.queue_manager.retry_dlq_jobs(pattern="%"), 0)
+
+    def test_retry_leaves_other_states_alone(self):
+        dead = self.add_dead_jobs(2, "job", "boom")
+        pending = self.queue_manager.enqueue("job 9")
+
+        self.assertEqual(self.queue_manager.retry_dlq_jobs(pattern="job%"), 2)
+        self.assertEqual(self.states(dead), {JobState.PENDING})
+        self.assertEqual(self.storage.get_job(pending.id).attempts, 0)
+
+    def test_rate_staggers_release_times(self):
+        job_ids = self.add_dead_jobs(7, "job", "boom")
+        before = datetime.now(timezone.utc)
+
+        self.assertEqual(self.queue_manager.retry_dlq_jobs(pattern="%", rate=2), 7)
+
+        jobs = [self.storage.get_job(job_id) for job_id in job_ids]
+        self.assertEqual({job.state for job in jobs}, {JobState.FAILED})
+        release_times = sorted(parse_time(job.next_retry_at) for job in jobs)
+        self.assertLess(abs(release_times[0] - before), timedelta(seconds=1))
+        self.assertEqual(
+            [later - earlier for earlier, later in zip(release_times, release_times[1:])],
+            [timedelta(seconds=0.5)] * 6,
+        )
+
+        now = datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z')
+        self.assertEqual(self.storage.promote_retryable_jobs(now), 1)
+
+    def test_rate_must_be_positive(self):
+        self.add_dead_jobs(1, "job", "boom")
+
+        for rate in (0, -1):
+            with self.assertRaises(ValueError):
+                self.queue_manager.retry_dlq_jobs(pattern="%", rate=rate)
+        self.assertEqual(self.queue_manager.get_status()["dead"], 1)
+
+    def test_purge_by_each_selector(self):
+        grouped = self.add_dead_jobs(2, "fetch http://a", "connection refused")
+        dated = self.add_dead_jobs(2, "dated", "boom", "2026-02-01T00:00:00Z")
+        matched = self.add_dead_jobs(2, "cleanup tmp", "boom")
+        kept = self.add_dead_jobs(2, "keep", "boom", "2025-12-01T00:00:00Z")
+        self.storage.apply_job_updates([], [(JobResult(grouped[0], 3, 1, "out", "err"), 1024)])
+
+        self.queue_manager.get_dlq_groups()
+        fingerprint = self.storage.get_job(grouped[0]).fingerprint
+        self.assertIsNotNone(fingerprint)
+
+        self.assertEqual(self.queue_manager.purge_dlq_jobs(fingerprint=fingerprint), 2)
+        self.assertEqual(self.queue_manager.purge_dlq_jobs(since="2026-02-01T00:00:00Z", until="2026-03-01T00:00:00Z"), 2)
+        self.assertEqual(self.queue_manager.purge_dlq_jobs(pattern="cleanup%"), 2)
+
+        for job_id in grouped + dated + matched:
+            self.assertIsNone(self.storage.get_job(job_id))
+        self.assertIsNone(self.storage.get_job_result(grouped[0]))
+        self.assertEqual(self.states(kept), {JobState.DEAD})
+
+    def test_purge_spans_several_batches(self):
+        self.add_dead_jobs(10, "job", "boom")
+
+        self.assertEqual(self.queue_manager.purge_dlq_jobs(pattern="%"), 10)
+        self.assertEqual(self.queue_manager.get_status()["total"], 0)
+
+if __name__ == "__main__":
+    unittest.main()
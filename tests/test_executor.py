@@ -0,0 +1,80 @@
+import os
+import threading
+import time
+import unittest
+
+from queuectl.executor import JobExecutor
+
+def is_running(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            return f.read().rsplit(")", 1)[1].split()[0] != "Z"
+    except OSError:
+        return True
+
+@unittest.skipUnless(os.name == "posix", "process groups and ulimit are POSIX only")
+class JobExecutorTestCase(unittest.TestCase):
+    def test_timeout_kills_the_whole_process_group(self):
+        executor = JobExecutor(timeout=1, kill_grace=1)
+
+        started = time.monotonic()
+        result = executor.run("sleep 30 & echo $!; sleep 30")
+        elapsed = time.monotonic() - started
+
+        self.assertFalse(result.success)
+        self.assertFalse(result.interrupted)
+        self.assertIn("timed out after 1 seconds", result.message)
+        self.assertLess(elapsed, 10)
+
+        background_pid = int(result.stdout.split()[0])
+        deadline = time.monotonic() + 2
+        while is_running(background_pid) and time.monotonic() < deadline:
+            time.sleep(0.05)
+        self.assertFalse(is_running(background_pid))
+
+    def test_stop_request_interrupts_the_job(self):
+        executor = JobExecutor(timeout=30, kill_grace=1)
+        threading.Timer(0.3, executor.request_stop).start()
+
+        started = time.monotonic()
+        result = executor.run("sleep 30")
+
+        self.assertTrue(result.interrupted)
+        self.assertFalse(result.success)
+        self.assertLess(time.monotonic() - started, 10)
+
+    def test_non_positive_timeout_falls_back_to_default(self):
+        result = JobExecutor(timeout=5).run("sleep 1; echo done", -1)
+
+        self.assertTrue(result.success)
+        self.assertEqual(result.stdout, "done\n")
+
+    def test_limits_are_applied_before_the_command(self):
+        result = JobExecutor(open_files=32).run("ulimit -n")
+
+        self.assertTrue(result.success)
+        self.assertEqual(result.stdout.strip(), "32")
+
+    def test_job_exits_126_when_limits_cannot_be_applied(self):
+        result = JobExecutor(open_files=10 ** 9).run("echo should-not-run")
+
+        self.assertFalse(result.success)
+        self.assertEqual(result.exit_code, JobExecutor.LIMIT_EXIT_CODE)
+        self.assertNotIn("should-not-run", result.stdout)
+
+    def test_output_keeps_a_bounded_tail(self):
+        executor = JobExecutor(output_max_bytes=1024)
+        result = executor.run("head -c 1000000 /dev/zero | tr '\\0' x; printf end")
+
+        self.assertTrue(result.success)
+        self.assertEqual(result.stdout_size, 1000003)
+        self.assertLessEqual(len(result.stdout), max(1024, JobExecutor.MESSAGE_TAIL_BYTES))
+        self.assertTrue(result.stdout.endswith("xend"))
+
+if __name__ == "__main__":
+    unittest.main()
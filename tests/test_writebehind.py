@@ -0,0 +1,127 @@
+import os
+import sqlite3
+import tempfile
+import time
+import unittest
+
+from queuectl.executor import ExecutionResult
+from queuectl.models import Config, JobState
+from queuectl.queue import QueueManager
+from queuectl.storage import Storage
+from queuectl.writebehind import WriteBehindBuffer
+
+class CountingConnection(sqlite3.Connection):
+    commits = 0
+
+    def commit(self):
+        CountingConnection.commits += 1
+        return super().commit()
+
+class FlakyStorage(Storage):
+    failures = 0
+
+    def apply_job_updates(self, updates, results=()):
+        if self.failures:
+            self.failures -= 1
+            raise sqlite3.OperationalError("database is locked")
+        return super().apply_job_updates(updates, results)
+
+class WriteBehindBufferTestCase(unittest.TestCase):
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tempdir.name, "queue.db")
+        self.storage = FlakyStorage(self.db_path)
+        self.queue_manager = QueueManager(self.storage, Config(db_path=self.db_path))
+
+    def tearDown(self):
+        self.tempdir.cleanup()
+
+    def make_buffer(self, max_delay_ms=60000, max_updates=1000):
+        write_buffer = WriteBehindBuffer(self.storage, max_delay_ms, max_updates)
+        self.addCleanup(write_buffer.close)
+        return write_buffer
+
+    def enqueue(self, count):
+        return [job.id for job in self.queue_manager.enqueue_batch([{"command": "true"}] * count)]
+
+    def state(self, job_id):
+        return self.storage.get_job(job_id).state
+
+    def test_flushes_after_interval(self):
+        write_buffer = self.make_buffer(max_delay_ms=50)
+        job_id = self.enqueue(1)[0]
+
+        write_buffer.add(job_id, {"state": JobState.COMPLETED})
+
+        deadline = time.monotonic() + 5
+        while self.state(job_id) != JobState.COMPLETED and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(self.state(job_id), JobState.COMPLETED)
+        self.assertEqual(write_buffer.commits, 1)
+
+    def test_flushes_when_batch_is_full(self):
+        write_buffer = self.make_buffer(max_updates=3)
+        job_ids = self.enqueue(3)
+
+        for job_id in job_ids[:2]:
+            write_buffer.add(job_id, {"state": JobState.COMPLETED})
+        self.assertEqual({self.state(job_id) for job_id in job_ids}, {JobState.PENDING})
+        self.assertEqual(write_buffer.commits, 0)
+
+        write_buffer.add(job_ids[2], {"state": JobState.COMPLETED})
+        self.assertEqual({self.state(job_id) for job_id in job_ids}, {JobState.COMPLETED})
+        self.assertEqual(write_buffer.commits, 1)
+
+    def test_failed_flush_requeues_updates_in_order(self):
+        write_buffer = self.make_buffer()
+        job_id = self.enqueue(1)[0]
+        write_buffer.add(job_id, {"state": JobState.FAILED, "attempts": 1})
+
+        self.storage.failures = 1
+        with self.assertRaises(sqlite3.OperationalError):
+            write_buffer.flush()
+        self.assertEqual(self.state(job_id), JobState.PENDING)
+
+        write_buffer.add(job_id, {"state": JobState.COMPLETED})
+        self.assertEqual(write_buffer.flush(), 2)
+
+        job = self.storage.get_job(job_id)
+        self.assertEqual((job.state, job.attempts), (JobState.COMPLETED, 1))
+        self.assertEqual(write_buffer.commits, 1)
+
+    def test_close_drains_pending_updates(self):
+        write_buffer = WriteBehindBuffer(self.storage, 60000, 1000)
+        job_ids = self.enqueue(5)
+        for job_id in job_ids:
+            write_buffer.add(job_id, {"state": JobState.COMPLETED})
+
+        write_buffer.close()
+
+        self.assertEqual({self.state(job_id) for job_id in job_ids}, {JobState.COMPLETED})
+        self.assertFalse(write_buffer._thread.is_alive())
+        self.assertEqual(write_buffer.flush(), 0)
+
+    def run_jobs(self, count, write_buffer):
+        self.enqueue(count)
+        queue_manager = QueueManager(self.storage, Config(db_path=self.db_path), write_buffer)
+        self.storage.connection_factory = CountingConnection
+        CountingConnection.commits = 0
+
+        for _ in range(count):
+            job = queue_manager.get_next_job()
+            queue_manager.record_result(job, ExecutionResult(True, "ok", 0, "ok\n"))
+        if write_buffer:
+            write_buffer.close()
+
+        self.assertEqual(self.queue_manager.get_status()["completed"], count)
+        return CountingConnection.commits
+
+    def test_commits_per_job(self):
+        self.assertEqual(self.run_jobs(50, None), 100)
+
+    def test_commits_per_job_with_group_commit(self):
+        write_buffer = WriteBehindBuffer(self.storage, 60000, 20)
+        self.assertEqual(self.run_jobs(50, write_buffer), 50 + 3)
+
+if __name__ == "__main__":
+    unittest.main()